@@ -0,0 +1,62 @@
+"""Time-to-first-window benchmark for the GUI (needs a display, e.g. under xvfb-run).
+
+The parent times each run from spawning a fresh interpreter until the child
+reports that the first frame is drawn, so interpreter start-up is included.
+The child's own split (import gui, build FocusFlowApp, first frame) is
+reported alongside; whatever the split does not cover is start-up.
+
+    xvfb-run -a python benchmarks/first_window.py [runs]
+"""
+import os
+import sys
+import time
+import statistics
+import subprocess
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def measure_once():
+    start = time.perf_counter()
+    sys.path.insert(0, ROOT)
+    # run in an empty directory so the benchmark never touches real data
+    os.chdir(tempfile.mkdtemp())
+    from gui import FocusFlowApp
+    imported = time.perf_counter()
+    app = FocusFlowApp()
+    built = time.perf_counter()
+    app.update()
+    shown = time.perf_counter()
+    # the parent stops its clock on this line, before the teardown below
+    print(f'{(imported - start) * 1000:.1f} {(built - imported) * 1000:.1f} {(shown - built) * 1000:.1f}', flush=True)
+    app.writer.stop()
+    app.destroy()
+
+def run_once():
+    """(total ms as seen by the parent, [import, build, first frame] ms as seen by the child)."""
+    start = time.perf_counter()
+    p = subprocess.Popen([sys.executable, __file__, '--once'], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    line = p.stdout.readline()
+    total = (time.perf_counter() - start) * 1000
+    _, err = p.communicate()
+    if p.returncode != 0 or not line.strip():
+        sys.exit(f'benchmark run failed:\n{err.decode(errors="replace")}')
+    return total, [float(v) for v in line.split()]
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    totals, splits = [], []
+    for _ in range(runs):
+        total, split = run_once()
+        totals.append(total)
+        splits.append(split)
+    print(f'{"interpreter start":20s} median {statistics.median(t - sum(s) for t, s in zip(totals, splits)):7.1f} ms')
+    for i, label in enumerate(('import gui', 'build FocusFlowApp', 'first frame')):
+        print(f'{label:20s} median {statistics.median(s[i] for s in splits):7.1f} ms')
+    print(f'{"time to first window":20s} median {statistics.median(totals):7.1f} ms over {runs} runs')
+
+if __name__ == '__main__':
+    if sys.argv[1:] == ['--once']:
+        measure_once()
+    else:
+        main()
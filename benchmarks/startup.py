@@ -0,0 +1,57 @@
+"""Startup benchmark.
+
+Times `main.py --cli` from launch to exit at its first menu, then lists the
+slowest imports reported by `python -X importtime` for the CLI and GUI paths.
+
+    python benchmarks/startup.py [runs]
+"""
+import os
+import sys
+import time
+import statistics
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CLI = ['main.py', '--cli']
+
+def run(args, importtime=False):
+    cmd = [sys.executable] + (['-X', 'importtime'] if importtime else []) + args
+    # '3' is "Exit" in the CLI's first menu
+    return subprocess.run(cmd, input=b'3\n', cwd=ROOT, capture_output=True, check=True)
+
+def cli_wall_times(runs):
+    times = []
+    for _ in range(runs):
+        t = time.perf_counter()
+        run(CLI)
+        times.append((time.perf_counter() - t) * 1000)
+    return times
+
+def slowest_imports(args, n=12):
+    """Total import time in ms, and (cumulative ms, module) of the n slowest imports."""
+    total, rows = 0, []
+    for line in run(args, importtime=True).stderr.decode().splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        ms = int(cumulative) / 1000
+        if not name[1:].startswith(' '):  # imported by the script itself, not by another module
+            total += ms
+        rows.append((ms, name.strip()))
+    rows.sort(reverse=True)
+    return total, rows[:n]
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    run(CLI)  # warm the bytecode cache
+    times = cli_wall_times(runs)
+    print(f'--cli to first menu: median {statistics.median(times):.1f} ms, '
+          f'min {min(times):.1f} ms over {runs} runs')
+    for label, args in (('CLI', CLI), ('GUI import', ['-c', 'import gui'])):
+        total, rows = slowest_imports(args)
+        print(f'\n{label}: {total:.1f} ms of imports')
+        for ms, name in rows:
+            print(f'  {ms:8.1f} ms  {name}')
+
+if __name__ == '__main__':
+    main()
@@ -1,10 +1,11 @@
-def analytics_cli(user):
+def analytics_cli(user, start=None, end=None):
     print('--- Analytics ---')
-    total = user.total_hours()
-    completed = user.total_productive_hours()
-    completion = user.completion_rate()
-    avg_cat = user.average_time_per_category()
-    score = user.productivity_score()
+    a = user.analytics(start, end)
+    total = a.total_hours
+    completed = a.completed_hours
+    completion = a.completion_rate
+    avg_cat = a.average_time_per_category
+    score = a.productivity_score
     print(f'Total hours: {total}')
     print(f'Completed hours: {completed}')
     print(f'Completion rate: {completion:.2f}%')
@@ -12,9 +12,14 @@ def restore_cli(user):
     if not p:
         print('No path')
         return
+    restore_from(user, p)
+
+def restore_from(user, p):
     try:
         user.restore(p)
         print('Restored')
+        return True
     except Exception as e:
         print('Failed to restore:', e)
+        return False
 
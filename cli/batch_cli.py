@@ -0,0 +1,197 @@
+import os
+import sys
+import csv
+import json
+import argparse
+from datetime import date, datetime
+from models.task import Task, parse_date
+from models.user import User
+from user_registry import get_registry
+from cli.task_cli import make_task, format_task
+from cli.analytics_cli import analytics_cli
+from cli.backup_cli import backup_cli, restore_from
+
+# column order of task files, backups and `export --format csv`
+CSV_FIELDS = ['name', 'category', 'hours', 'completed', 'date', 'id']
+TRUE_WORDS = ('1', 'true', 'yes', 'y', 'done')
+
+def add_batch_commands(parser):
+    """Register the non-interactive subcommands on main.py's argument parser."""
+    auth = argparse.ArgumentParser(add_help=False)
+    auth.add_argument('-u', '--user', required=True)
+    auth.add_argument('-p', '--password', help='Default: $FOCUSFLOW_PASSWORD')
+    sub = parser.add_subparsers(dest='command', metavar='command')
+
+    p = sub.add_parser('add', parents=[auth], help='Add one task')
+    p.add_argument('name')
+    p.add_argument('--category', default='')
+    p.add_argument('--hours', default='')
+    p.add_argument('--done', action='store_true', help='Mark as completed')
+    p.add_argument('--date', default='', help='YYYY-MM-DD (default today)')
+
+    p = sub.add_parser('list', parents=[auth], help='List tasks with their ids')
+    p.add_argument('--from', dest='start', help='First date, YYYY-MM-DD')
+    p.add_argument('--to', dest='end', help='Last date, YYYY-MM-DD')
+    p.add_argument('--category')
+
+    p = sub.add_parser('update', parents=[auth], help='Change fields of one task')
+    p.add_argument('id')
+    p.add_argument('--name')
+    p.add_argument('--category')
+    p.add_argument('--hours', type=float)
+    p.add_argument('--done', dest='completed', action='store_true', default=None)
+    p.add_argument('--pending', dest='completed', action='store_false')
+    p.add_argument('--date')
+
+    p = sub.add_parser('delete', parents=[auth], help='Delete tasks by id')
+    p.add_argument('ids', nargs='+')
+
+    p = sub.add_parser('analytics', parents=[auth], help='Print analytics')
+    p.add_argument('--from', dest='start')
+    p.add_argument('--to', dest='end')
+
+    sub.add_parser('backup', parents=[auth], help='Write a backup CSV to the data directory')
+
+    p = sub.add_parser('restore', parents=[auth], help='Replace all tasks with a backup CSV')
+    p.add_argument('path')
+
+    p = sub.add_parser('import', parents=[auth], help='Add tasks from JSON or CSV in one write')
+    p.add_argument('path', nargs='?', default='-', help='File to read (default: stdin)')
+    p.add_argument('--format', choices=['json', 'csv'], help='Default: from the file extension, else sniffed')
+
+    p = sub.add_parser('export', parents=[auth], help='Write all tasks as JSON or CSV')
+    p.add_argument('path', nargs='?', default='-', help='File to write (default: stdout)')
+    p.add_argument('--format', choices=['json', 'csv'], help='Default: from the file extension, else csv')
+
+# ---------- import / export ----------
+def _format_for(path, given, text=None):
+    if given:
+        return given
+    ext = os.path.splitext(path)[1].lower()
+    if ext in ('.json', '.csv'):
+        return ext[1:]
+    if text is not None and text.lstrip()[:1] in ('[', '{'):
+        return 'json'
+    return 'csv'
+
+def _task_from_dict(d):
+    completed = d.get('completed', False)
+    if isinstance(completed, str):
+        completed = completed.strip().lower() in TRUE_WORDS
+    return Task(d['name'], d.get('category') or 'General', d.get('hours') or 0.0,
+                completed, d.get('date') or datetime.now().date().isoformat(), d.get('id') or None)
+
+def parse_tasks(text, fmt):
+    """Tasks from JSON (a list of objects, or one object per line) or CSV text."""
+    if fmt == 'json':
+        text = text.strip()
+        if text.startswith('['):
+            records = json.loads(text)
+        else:
+            records = [json.loads(line) for line in text.splitlines() if line.strip()]
+        return [_task_from_dict(d) for d in records]
+    rows = [r for r in csv.reader(text.splitlines()) if r]
+    if rows and rows[0][0].strip().lower() == 'name':
+        # a header row: columns may come in any order and carry friendlier values
+        header = [h.strip().lower() for h in rows[0]]
+        return [_task_from_dict(dict(zip(header, r))) for r in rows[1:]]
+    # same layout as the task files and backups
+    return Task.from_csv_rows(rows)
+
+def import_tasks(user, path, fmt=None):
+    if path == '-':
+        text = sys.stdin.read()
+    else:
+        with open(path, 'r', newline='', encoding='utf-8') as f:
+            text = f.read()
+    try:
+        tasks = parse_tasks(text, _format_for(path, fmt, text))
+    except (IndexError, KeyError, TypeError, csv.Error) as e:
+        raise ValueError(f'{path}: not a list of tasks ({type(e).__name__}: {e})') from None
+    return user.add_tasks(tasks)
+
+def export_tasks(user, path, fmt=None):
+    fmt = _format_for(path, fmt)
+    out = sys.stdout if path == '-' else open(path, 'w', newline='', encoding='utf-8')
+    try:
+        if fmt == 'json':
+            json.dump([dict(zip(CSV_FIELDS, [t.name, t.category, t.hours, t.completed, t.date.isoformat(), t.id]))
+                       for t in user.iter_tasks()], out, indent=1)
+            out.write('\n')
+        else:
+            writer = csv.writer(out)
+            for t in user.iter_tasks():
+                writer.writerow(t.to_csv_row())
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+# ---------- dispatch ----------
+def _range(args):
+    """--from/--to as dates, None where not given."""
+    return (parse_date(args.start) if args.start else None,
+            parse_date(args.end) if args.end else None)
+
+def run_batch(args):
+    """Run one subcommand; returns the process exit code."""
+    password = args.password if args.password is not None else os.environ.get('FOCUSFLOW_PASSWORD', '')
+    if not get_registry().check_password(args.user, password):
+        print('Invalid credentials', file=sys.stderr)
+        return 1
+    # list and export stream from disk; everything else works on the loaded history
+    try:
+        user = User(args.user, load=args.command not in ('list', 'export'))
+    except Exception as e:
+        print('Cannot load tasks:', e, file=sys.stderr)
+        return 1
+    try:
+        return _run(user, args)
+    except (ValueError, OSError) as e:
+        # bad dates, numbers or input files: one line instead of a traceback
+        print('Error:', e, file=sys.stderr)
+        return 1
+
+def _run(user, args):
+    cmd = args.command
+    if cmd == 'add':
+        # make_task falls back to defaults for the prompts; a script gets an error instead
+        if args.hours:
+            float(args.hours)
+        if args.date:
+            parse_date(args.date)
+        t = make_task(args.name, args.category, args.hours, args.done, args.date)
+        user.add_task(t)
+        print(t.id)
+    elif cmd == 'list':
+        start, end = _range(args)
+        for t in user.iter_tasks(start, end):
+            if args.category is None or t.category == args.category:
+                print(f'{t.id} {format_task(t)}')
+    elif cmd == 'update':
+        fields = {k: getattr(args, k) for k in ('name', 'category', 'hours', 'completed', 'date')
+                  if getattr(args, k) is not None}
+        if not user.update_task_by_id(args.id, **fields):
+            print('No task with id', args.id, file=sys.stderr)
+            return 1
+    elif cmd == 'delete':
+        missing = [tid for tid in args.ids if user.get_task(tid) is None]
+        user.delete_tasks(args.ids)
+        for tid in missing:
+            print('No task with id', tid, file=sys.stderr)
+        return 1 if missing else 0
+    elif cmd == 'analytics':
+        start, end = _range(args)
+        if start or end:
+            # User.analytics() covers the whole history unless given both ends; like `list`,
+            # a range given on one side only is open on the other
+            start, end = start or date.min, end or date.max
+        analytics_cli(user, start, end)
+    elif cmd == 'backup':
+        backup_cli(user)
+    elif cmd == 'restore':
+        return 0 if restore_from(user, args.path) else 1
+    elif cmd == 'import':
+        print(f'Imported {import_tasks(user, args.path, args.format)} tasks', file=sys.stderr)
+    elif cmd == 'export':
+        export_tasks(user, args.path, args.format)
+    return 0
@@ -0,0 +1,39 @@
+import os
+from utils.paths import DATA_DIR, DB_FILE
+from models.user import User
+from models.storage import SQLiteStorage, sqlite_save_users
+from user_registry import UserRegistry
+
+def _file_histories():
+    # username -> backend of every history in DATA_DIR: a base file (tasks_<user>.csv / .ffb), or
+    # only a journal (tasks_<user>.journal / .ffb.journal) while it has never been compacted
+    found = {}
+    if not os.path.isdir(DATA_DIR):
+        return found
+    for f in sorted(os.listdir(DATA_DIR)):
+        if not f.startswith('tasks_'):
+            continue
+        name, ext = os.path.splitext(f[len('tasks_'):])
+        if ext == '.journal':
+            name, ext = os.path.splitext(name)
+            if ext != '.ffb':
+                name, ext = name + ext, '.csv'
+        if ext == '.csv':
+            found.setdefault(name, 'csv')
+        elif ext == '.ffb':
+            found[name] = 'binary'
+    return found
+
+def migrate_to_sqlite(db_path=None):
+    """Copy the registered users and every user's task files (journals included) into the SQLite database."""
+    db_path = db_path or DB_FILE
+    users = UserRegistry().all()
+    sqlite_save_users(users, db_path)
+    print(f'Users: {len(users)}')
+
+    for username, backend in _file_histories().items():
+        user = User(username, columnar=False, storage=backend)
+        SQLiteStorage(username, db_path).write_tasks(user.tasks)
+        print(f' - {username}: {len(user.tasks)} tasks ({backend})')
+    print('Migrated into', db_path)
+    print('Set FOCUSFLOW_STORAGE=sqlite to use it.')
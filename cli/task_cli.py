@@ -1,23 +1,31 @@
 from models.task import Task
 from datetime import datetime
 
-def add_task_cli(user):
-    print('--- Add Task ---')
-    name = input('Task name: ').strip()
-    category = input('Category: ').strip() or 'General'
-    hours = input('Hours spent: ').strip()
+def make_task(name, category='', hours='', completed=False, date_in=''):
+    # loosely typed input (prompt answers, command-line options) with the prompts' defaults
     try:
         hours = float(hours)
     except:
         hours = 0.0
-    completed = input('Completed? (y/n): ').strip().lower() == 'y'
-    date_in = input('Date (YYYY-MM-DD) [default today]: ').strip() or datetime.now().date().isoformat()
+    date_in = date_in or datetime.now().date().isoformat()
     try:
         datetime.strptime(date_in, '%Y-%m-%d')
     except:
         date_in = datetime.now().date().isoformat()
-    t = Task(name, category, hours, completed, date_in)
-    user.add_task(t)
+    return Task(name, category or 'General', hours, completed, date_in)
+
+def format_task(t):
+    status = 'Done' if t.completed else 'Pending'
+    return f"[{status}] {t.date.isoformat()} - {t.name} ({t.category}) - {t.hours}h"
+
+def add_task_cli(user):
+    print('--- Add Task ---')
+    name = input('Task name: ').strip()
+    category = input('Category: ').strip()
+    hours = input('Hours spent: ').strip()
+    completed = input('Completed? (y/n): ').strip().lower() == 'y'
+    date_in = input('Date (YYYY-MM-DD) [default today]: ').strip()
+    user.add_task(make_task(name, category, hours, completed, date_in))
     print('Task added')
 
 def view_tasks_cli(user):
@@ -25,8 +33,7 @@ def view_tasks_cli(user):
         print('No tasks')
         return
     for i, t in enumerate(user.tasks):
-        status = 'Done' if t.completed else 'Pending'
-        print(f"{i}. [{status}] {t.date.isoformat()} - {t.name} ({t.category}) - {t.hours}h")
+        print(f"{i}. {format_task(t)}")
 
 def update_task_cli(user):
     view_tasks_cli(user)
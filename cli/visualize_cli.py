@@ -1,22 +1,17 @@
-import matplotlib.pyplot as plt
-import numpy as np
-
 def visualize_cli(user):
     if not user.tasks:
         print('No data to visualize')
         return
-    categories = {}
-    dates = {}
-    completed = 0
-    pending = 0
-    for t in user.tasks:
-        categories[t.category] = categories.get(t.category, 0) + t.hours
-        dates.setdefault(t.date.isoformat(), 0)
-        if t.completed:
-            dates[t.date.isoformat()] += t.hours
-            completed += 1
-        else:
-            pending += 1
+    # plotting stack is loaded only when a chart is actually asked for
+    import matplotlib.pyplot as plt
+    import matplotlib.dates as mdates
+    import numpy as np
+    from models.timeseries import completed_hours_series
+    categories = user.hours_by_category()
+    days, daily_hours = user.daily_completed_hours()
+    a = user.analytics()
+    completed = a.completed_count
+    pending = a.pending_count
 
     print('1)Hours per category')
     print('2)Productivity over days')
@@ -31,12 +26,18 @@ def visualize_cli(user):
 
     if ch in ('2','3'):
         # line
-        if not dates:
+        if not days:
             print('Not enough data')
         else:
-            sd = sorted(dates.items())
-            xs = [d for d,_ in sd]; ys=[h for _,h in sd]
-            plt.figure(); plt.plot(xs, ys, marker='o'); plt.title('Productivity Over Days'); plt.xticks(rotation=45); plt.show()
+            w = input('Last N days (blank for all): ').strip()
+            xs, ys, freq = completed_hours_series(days, daily_hours, window_days=int(w) if w.isdigit() else None)
+            if not len(xs):
+                print('No completed tasks in that window')
+            else:
+                # bucketed by day/week/month, so long histories stay readable
+                fig, ax = plt.subplots(); ax.plot(xs, ys, marker='o' if len(xs) <= 60 else None)
+                locator = mdates.AutoDateLocator(); ax.xaxis.set_major_locator(locator); ax.xaxis.set_major_formatter(mdates.ConciseDateFormatter(locator))
+                ax.set_title(f'Productivity per {freq.capitalize()}'); plt.show()
 
     if ch=='3':
         plt.figure(); plt.pie([completed,pending], labels=['Completed','Pending'], autopct='%1.1f%%'); plt.title('Completed vs Pending'); plt.show()
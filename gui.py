@@ -1,5 +1,8 @@
 import os
+import queue
 import random
+import threading
+from functools import lru_cache
 from datetime import datetime, date
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
@@ -9,11 +12,15 @@ import matplotlib
 matplotlib.use("TkAgg")
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import matplotlib.pyplot as plt
+import matplotlib.dates as mdates
 import numpy as np
 
-from user_system import load_users, save_users
+from user_registry import get_registry
 from models.task import Task
+from models.analytics import Analytics
 from models.user import User
+from models.persistence import PersistenceWorker
+from models.timeseries import completed_hours_series
 from utils.quotes import QUOTES
 from utils.paths import DATA_DIR
 
@@ -36,12 +43,44 @@ COLORS = {
 
 APP_TITLE = "FocusFlow "
 
+@lru_cache(maxsize=None)
+def font(size, weight="normal"):
+    # every CTkFont is a Tk named font; share one per size/weight instead of making one per widget
+    return ctk.CTkFont(size=size, weight=weight)
+
+class RowPool:
+    """Row widgets under one parent that are reconfigured instead of destroyed and rebuilt.
+
+    make_row(parent) builds an empty row, fill_row(row, item) sets its contents;
+    rows beyond the current item count are unpacked and kept for later.
+    """
+    def __init__(self, parent, make_row, fill_row, **pack):
+        self.parent = parent
+        self.make_row = make_row
+        self.fill_row = fill_row
+        self.pack = pack
+        self.rows = []
+        self.visible = 0
+    
+    def show(self, items):
+        n = 0
+        for n, item in enumerate(items, 1):
+            if n > len(self.rows):
+                self.rows.append(self.make_row(self.parent))
+            row = self.rows[n - 1]
+            self.fill_row(row, item)
+            if n > self.visible:
+                row.pack(**self.pack)
+        for row in self.rows[n:self.visible]:
+            row.pack_forget()
+        self.visible = n
+
 def today_iso():
     return date.today().isoformat()
 
-def safe_user(username):
+def safe_user(username, load=True):
     try:
-        return User(username)
+        return User(username, load=load)
     except Exception as e:
         messagebox.showerror("Backend error", f"Cannot instantiate user: {e}")
         return None
@@ -54,6 +93,16 @@ class FocusFlowApp(ctk.CTk):
         self.minsize(1200, 700)
         
         self.current_user = None
+        self._loading = None  # User whose history is being read on a worker thread
+        # other threads never call into Tk themselves (a Tk call from another thread waits for the
+        # event loop, which deadlocks while the Tk thread waits on that thread in writer.flush());
+        # they queue callbacks with call_soon and the Tk thread polls for them
+        self._calls = queue.Queue()
+        self._poll_job = None
+        self._poll_calls()
+        # task writes go to disk on this thread so the event loop never waits on I/O
+        self.writer = PersistenceWorker(on_error=self._on_write_error)
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
         
         # Enhanced topbar with gradient effect
         topbar = ctk.CTkFrame(self, height=70, corner_radius=0, fg_color=COLORS["bg_dark"])
@@ -67,14 +116,14 @@ class FocusFlowApp(ctk.CTk):
         ctk.CTkLabel(
             title_frame, 
             text="FocusFlow", 
-            font=ctk.CTkFont(size=28, weight="bold"),
+            font=font(28, "bold"),
             text_color=COLORS["primary"]
         ).pack(side="left")
         
         ctk.CTkLabel(
             title_frame,
             text="Productivity Analyzer",
-            font=ctk.CTkFont(size=12),
+            font=font(12),
             text_color=COLORS["text_muted"]
         ).pack(side="left", padx=(10, 0))
         
@@ -112,6 +161,28 @@ class FocusFlowApp(ctk.CTk):
         self._build_pages()
         self.show_page("LoginPage")
     
+    def call_soon(self, fn, *args):
+        """Run fn(*args) on the Tk thread; safe to call from any thread."""
+        self._calls.put((fn, args))
+    
+    def _poll_calls(self):
+        self._poll_job = self.after(50, self._poll_calls)
+        while True:
+            try:
+                fn, args = self._calls.get_nowait()
+            except queue.Empty:
+                return
+            fn(*args)
+    
+    def _on_write_error(self, exc):
+        # runs on the persistence thread; hand the message to the Tk thread
+        self.call_soon(messagebox.showerror, "Save failed", f"Could not save your changes: {exc}")
+    
+    def _on_close(self):
+        self.writer.stop()
+        self.after_cancel(self._poll_job)
+        self.destroy()
+    
     def _on_theme(self, val):
         ctk.set_appearance_mode(val.lower())
     
@@ -123,13 +194,13 @@ class FocusFlowApp(ctk.CTk):
         ctk.CTkLabel(
             profile_frame,
             text="👤",
-            font=ctk.CTkFont(size=32)
+            font=font(32)
         ).pack()
         
         self.sidebar_user_label = ctk.CTkLabel(
             profile_frame,
             text="Not logged in",
-            font=ctk.CTkFont(size=14, weight="bold"),
+            font=font(14, "bold"),
             text_color=COLORS["text_muted"]
         )
         self.sidebar_user_label.pack(pady=(5, 0))
@@ -141,7 +212,7 @@ class FocusFlowApp(ctk.CTk):
         ctk.CTkLabel(
             self.sidebar,
             text="NAVIGATION",
-            font=ctk.CTkFont(size=11, weight="bold"),
+            font=font(11, "bold"),
             text_color=COLORS["text_muted"]
         ).pack(anchor="w", padx=20, pady=(10, 5))
         
@@ -158,48 +229,95 @@ class FocusFlowApp(ctk.CTk):
             hover_color=COLORS["primary"],
             anchor="w",
             height=40,
-            font=ctk.CTkFont(size=14)
+            font=font(14)
         )
     
     def _build_pages(self):
+        # pages are built the first time they are shown, not all at startup
+        self.page_factories = {Page.__name__: Page for Page in (LoginPage, RegisterPage, DashboardPage)}
         self.pages = {}
-        for Page in (LoginPage, RegisterPage, DashboardPage):
-            page = Page(self.content, self)
-            self.pages[Page.__name__] = page
-            page.grid(row=0, column=0, sticky="nsew")
     
-    def show_page(self, name: str):
+    def page(self, name: str):
         p = self.pages.get(name)
+        if p is None and name in self.page_factories:
+            p = self.page_factories[name](self.content, self)
+            self.pages[name] = p
+            p.grid(row=0, column=0, sticky="nsew")
+        return p
+    
+    def show_page(self, name: str):
+        p = self.page(name)
         if p:
             p.tkraise()
     
     def login_success(self, username: str):
-        user_obj = safe_user(username)
+        # opening the storage is cheap; reading the history happens off the Tk thread
+        user_obj = safe_user(username, load=False)
         if not user_obj:
             return
-        self.current_user = user_obj
+        user_obj.writer = self.writer
+        self._loading = user_obj
         self.sidebar_user_label.configure(
             text=f"{username}",
             text_color=COLORS["primary"]
         )
-        dash: DashboardPage = self.pages["DashboardPage"]
-        dash.set_user(self.current_user)
+        dash: DashboardPage = self.page("DashboardPage")
+        dash.begin_loading(username)
         self.show_page("DashboardPage")
         dash.show_home()
+        threading.Thread(target=self._load_user, args=(user_obj,), daemon=True).start()
+    
+    def _load_user(self, user):
+        # worker thread: today's tasks first so the home card can render, then everything.
+        # A CSV file has to be parsed in full to find one day, so there it is read only once.
+        if user.storage.range_scan_is_cheap:
+            today = date.today()
+            try:
+                todays = list(user.iter_tasks(today, today))
+            except Exception:
+                todays = []
+            self.call_soon(self._on_user_preview, user, todays)
+        try:
+            user.load_tasks()
+            error = None
+        except Exception as e:
+            error = e
+        self.call_soon(self._on_user_loaded, user, error)
+    
+    def _on_user_preview(self, user, todays):
+        if self._loading is user:
+            self.page("DashboardPage").show_preview(user.username, todays)
+    
+    def _on_user_loaded(self, user, error):
+        if self._loading is not user:
+            return  # logged out (or in as someone else) meanwhile
+        self._loading = None
+        if error is not None:
+            # an unreadable history must not be shown as empty and then saved over
+            messagebox.showerror("Backend error", f"Cannot load tasks: {error}")
+            self._end_session()
+            return
+        self.current_user = user
+        self.page("DashboardPage").set_user(user)
     
     def logout(self):
         if messagebox.askyesno("Logout", "Are you sure you want to logout?"):
-            self.current_user = None
-            self.sidebar_user_label.configure(
-                text="Not logged in",
-                text_color=COLORS["text_muted"]
-            )
-            self.show_page("LoginPage")
+            self.writer.flush()
+            self._end_session()
+    
+    def _end_session(self):
+        self._loading = None
+        self.page("DashboardPage").preview = None
+        self.current_user = None
+        self.sidebar_user_label.configure(
+            text="Not logged in",
+            text_color=COLORS["text_muted"]
+        )
+        self.show_page("LoginPage")
     
     def _show_home_from_sidebar(self):
-        if "DashboardPage" in self.pages:
-            self.show_page("DashboardPage")
-            self.pages["DashboardPage"].show_home()
+        self.show_page("DashboardPage")
+        self.page("DashboardPage").show_home()
 
 class LoginPage(ctk.CTkFrame):
     def __init__(self, parent, app: FocusFlowApp):
@@ -231,19 +349,19 @@ class LoginPage(ctk.CTkFrame):
         ctk.CTkLabel(
             self.card,
             text="🎯",
-            font=ctk.CTkFont(size=48)
+            font=font(48)
         ).pack(pady=(30, 10))
         
         ctk.CTkLabel(
             self.card,
             text="Welcome to FocusFlow",
-            font=ctk.CTkFont(size=26, weight="bold")
+            font=font(26, "bold")
         ).pack(pady=(0, 5))
         
         ctk.CTkLabel(
             self.card,
             text="Track your productivity journey",
-            font=ctk.CTkFont(size=13),
+            font=font(13),
             text_color=COLORS["text_muted"]
         ).pack(pady=(0, 25))
         
@@ -254,7 +372,7 @@ class LoginPage(ctk.CTkFrame):
         ctk.CTkLabel(
             form,
             text="Username",
-            font=ctk.CTkFont(size=12, weight="bold"),
+            font=font(12, "bold"),
             anchor="w"
         ).pack(fill="x", pady=(0, 5))
         
@@ -270,7 +388,7 @@ class LoginPage(ctk.CTkFrame):
         ctk.CTkLabel(
             form,
             text="Password",
-            font=ctk.CTkFont(size=12, weight="bold"),
+            font=font(12, "bold"),
             anchor="w"
         ).pack(fill="x", pady=(0, 5))
         
@@ -290,7 +408,7 @@ class LoginPage(ctk.CTkFrame):
             text="Login",
             height=45,
             command=self.attempt_login,
-            font=ctk.CTkFont(size=14, weight="bold"),
+            font=font(14, "bold"),
             fg_color=COLORS["primary"],
             hover_color=COLORS["primary_hover"],
             corner_radius=10
@@ -301,7 +419,7 @@ class LoginPage(ctk.CTkFrame):
             text="Create Account",
             height=45,
             command=lambda: self.app.show_page("RegisterPage"),
-            font=ctk.CTkFont(size=14),
+            font=font(14),
             fg_color="transparent",
             border_width=2,
             border_color=COLORS["primary"],
@@ -315,8 +433,7 @@ class LoginPage(ctk.CTkFrame):
         if not username or not password:
             messagebox.showwarning("Input", "Please enter username and password")
             return
-        users = load_users()
-        if username in users and users[username]["password"] == password:
+        if get_registry().check_password(username, password):
             self.app.login_success(username)
         else:
             messagebox.showerror("Login failed", "Invalid username or password")
@@ -349,19 +466,19 @@ class RegisterPage(ctk.CTkFrame):
         ctk.CTkLabel(
             self.card,
             text="✨",
-            font=ctk.CTkFont(size=48)
+            font=font(48)
         ).pack(pady=(30, 10))
         
         ctk.CTkLabel(
             self.card,
             text="Create Your Account",
-            font=ctk.CTkFont(size=26, weight="bold")
+            font=font(26, "bold")
         ).pack(pady=(0, 5))
         
         ctk.CTkLabel(
             self.card,
             text="Start your productivity journey today",
-            font=ctk.CTkFont(size=13),
+            font=font(13),
             text_color=COLORS["text_muted"]
         ).pack(pady=(0, 25))
         
@@ -371,7 +488,7 @@ class RegisterPage(ctk.CTkFrame):
         ctk.CTkLabel(
             form,
             text="Username",
-            font=ctk.CTkFont(size=12, weight="bold"),
+            font=font(12, "bold"),
             anchor="w"
         ).pack(fill="x", pady=(0, 5))
         
@@ -387,7 +504,7 @@ class RegisterPage(ctk.CTkFrame):
         ctk.CTkLabel(
             form,
             text="Password",
-            font=ctk.CTkFont(size=12, weight="bold"),
+            font=font(12, "bold"),
             anchor="w"
         ).pack(fill="x", pady=(0, 5))
         
@@ -404,7 +521,7 @@ class RegisterPage(ctk.CTkFrame):
         ctk.CTkLabel(
             form,
             text="Confirm Password",
-            font=ctk.CTkFont(size=12, weight="bold"),
+            font=font(12, "bold"),
             anchor="w"
         ).pack(fill="x", pady=(0, 5))
         
@@ -423,7 +540,7 @@ class RegisterPage(ctk.CTkFrame):
             text="Create Account",
             height=45,
             command=self.create_account,
-            font=ctk.CTkFont(size=14, weight="bold"),
+            font=font(14, "bold"),
             fg_color=COLORS["success"],
             hover_color="#059669",
             corner_radius=10
@@ -434,7 +551,7 @@ class RegisterPage(ctk.CTkFrame):
             text="Back to Login",
             height=45,
             command=lambda: self.app.show_page("LoginPage"),
-            font=ctk.CTkFont(size=14),
+            font=font(14),
             fg_color="transparent",
             border_width=2,
             border_color=COLORS["text_muted"],
@@ -452,21 +569,27 @@ class RegisterPage(ctk.CTkFrame):
         if p != c:
             messagebox.showerror("Error", "Passwords do not match")
             return
-        users = load_users()
-        if u in users:
+        if not get_registry().add(u, {"password": p}):
             messagebox.showerror("Error", "Username already exists")
             return
-        users[u] = {"password": p}
-        save_users(users)
         messagebox.showinfo("Success", "Account created! You can now login.")
         self.app.show_page("LoginPage")
 
 class DashboardPage(ctk.CTkFrame):
+    # cards that show task data; only these go stale when the user's tasks change
+    DATA_CARDS = ("HomeCard", "TasksCard", "AnalyticsCard", "VisualizeCard")
+    
     def __init__(self, parent, app: FocusFlowApp):
         super().__init__(parent)
         self.app = app
         self.user = None
+        # (username, today's tasks or None) while the history loads in the background
+        self.preview = None
         self.current_nav_button = None
+        self.visible = None
+        # cards whose data changed since they last rendered
+        self.dirty = set()
+        self._refresh_scheduled = False
         
         self.columnconfigure(1, weight=1)
         
@@ -485,7 +608,7 @@ class DashboardPage(ctk.CTkFrame):
         ctk.CTkLabel(
             left,
             text="MENU",
-            font=ctk.CTkFont(size=11, weight="bold"),
+            font=font(11, "bold"),
             text_color=COLORS["text_muted"]
         ).pack(anchor="w", padx=15, pady=(15, 10))
         
@@ -518,23 +641,23 @@ class DashboardPage(ctk.CTkFrame):
             hover_color="#dc2626",
             height=40,
             corner_radius=8,
-            font=ctk.CTkFont(size=13, weight="bold")
+            font=font(13, "bold")
         ).pack(fill="x", padx=12, pady=(5, 15))
         
         self.lbl_user = ctk.CTkLabel(
             left,
             text="Not logged in",
-            font=ctk.CTkFont(size=11),
+            font=font(11),
             text_color=COLORS["text_muted"]
         )
         self.lbl_user.pack(side="bottom", pady=15)
         
-        # Pages
+        # Pages, each built the first time it is shown
+        self.page_factories = {
+            Page.__name__: Page
+            for Page in (HomeCard, AddTaskCard, TasksCard, AnalyticsCard, VisualizeCard, BackupCard)
+        }
         self.pages = {}
-        for Page in (HomeCard, AddTaskCard, TasksCard, AnalyticsCard, VisualizeCard, BackupCard):
-            pg = Page(self.content_area, self)
-            self.pages[Page.__name__] = pg
-            pg.grid(row=0, column=0, sticky="nsew")
         
         self.show_home()
     
@@ -547,20 +670,74 @@ class DashboardPage(ctk.CTkFrame):
             hover_color=COLORS["primary"],
             anchor="w",
             height=38,
-            font=ctk.CTkFont(size=13)
+            font=font(13)
         )
     
+    def page(self, name):
+        pg = self.pages.get(name)
+        if pg is None:
+            pg = self.page_factories[name](self.content_area, self)
+            self.pages[name] = pg
+            pg.grid(row=0, column=0, sticky="nsew")
+            # a new card renders the current data while it is built
+            self.dirty.discard(name)
+        return pg
+    
+    def begin_loading(self, username):
+        if self.user:
+            self.user.unsubscribe(self._on_user_change)
+        self.user = None
+        self.dirty.update(self.DATA_CARDS)
+        self.preview = (username, None)
+        self.lbl_user.configure(text=f"👤 {username}")
+    
+    def show_preview(self, username, todays):
+        self.preview = (username, todays)
+        self.page("HomeCard").refresh()
+    
     def set_user(self, user: User):
+        if self.user:
+            self.user.unsubscribe(self._on_user_change)
         self.user = user
+        self.preview = None
         self.lbl_user.configure(text=f"👤 {user.username}")
-        for p in self.pages.values():
-            if hasattr(p, "refresh"):
-                try:
-                    p.refresh()
-                except Exception:
-                    pass
+        user.subscribe(self._on_user_change)
+        self._on_user_change("reload", None)
         self._remind_unfinished()
     
+    def _on_user_change(self, event, task):
+        # cards with apply_change patch themselves in place; the rest are marked stale
+        # and catch up when shown, or once the current event is handled if visible
+        for name in self.DATA_CARDS:
+            if name not in self.pages:
+                continue  # not built yet; it starts from the current data anyway
+            apply_change = getattr(self.pages[name], "apply_change", None)
+            if event != "reload" and apply_change is not None and apply_change(event, task):
+                continue
+            self.dirty.add(name)
+        if self.visible in self.dirty and not self._refresh_scheduled:
+            self._refresh_scheduled = True
+            self.after_idle(self._refresh_visible)
+    
+    def _refresh_visible(self):
+        self._refresh_scheduled = False
+        self._refresh_page(self.visible)
+    
+    def _refresh_page(self, name):
+        if name in self.dirty:
+            self.dirty.discard(name)
+            try:
+                self.page(name).refresh()
+            except Exception:
+                pass
+    
+    def _show(self, key, name):
+        self._highlight_nav(key)
+        self.visible = name
+        pg = self.page(name)
+        self._refresh_page(name)
+        pg.tkraise()
+    
     def _remind_unfinished(self):
         if not self.user:
             return
@@ -582,33 +759,24 @@ class DashboardPage(ctk.CTkFrame):
                 btn.configure(fg_color="transparent", hover_color=COLORS["primary"])
     
     def show_home(self): 
-        self._highlight_nav("home")
-        self.pages["HomeCard"].refresh()
-        self.pages["HomeCard"].tkraise()
+        self._show("home", "HomeCard")
     
     def show_add(self): 
-        self._highlight_nav("add")
-        self.pages["AddTaskCard"].tkraise()
+        self._show("add", "AddTaskCard")
     
     def show_tasks(self): 
-        self._highlight_nav("tasks")
-        self.pages["TasksCard"].refresh()
-        self.pages["TasksCard"].tkraise()
+        self._show("tasks", "TasksCard")
     
     def show_analytics(self): 
-        self._highlight_nav("analytics")
-        self.pages["AnalyticsCard"].refresh()
-        self.pages["AnalyticsCard"].tkraise()
+        self._show("analytics", "AnalyticsCard")
     
     def show_visualize(self): 
-        self._highlight_nav("visualize")
-        self.pages["VisualizeCard"].refresh()
-        self.pages["VisualizeCard"].tkraise()
+        self._show("visualize", "VisualizeCard")
     
     def show_backup(self): 
-        self._highlight_nav("backup")
-        self.pages["BackupCard"].refresh()
-        self.pages["BackupCard"].tkraise()
+        # lists backup files rather than tasks, so it is always re-read
+        self.dirty.add("BackupCard")
+        self._show("backup", "BackupCard")
 
 class HomeCard(ctk.CTkFrame):
     def __init__(self, parent, dashboard: DashboardPage):
@@ -626,19 +794,23 @@ class HomeCard(ctk.CTkFrame):
         self.lbl_welcome = ctk.CTkLabel(
             welcome_card,
             text="Welcome!",
-            font=ctk.CTkFont(size=28, weight="bold")
+            font=font(28, "bold")
         )
         self.lbl_welcome.pack(pady=(20, 5), padx=20)
         
         self.lbl_quote = ctk.CTkLabel(
             welcome_card,
             text=random.choice(QUOTES),
-            font=ctk.CTkFont(size=13),
+            font=font(13),
             text_color=COLORS["text_muted"],
             wraplength=500
         )
         self.lbl_quote.pack(pady=(0, 20), padx=20)
         
+        # shown while the task history loads in the background
+        self.loading_bar = ctk.CTkProgressBar(welcome_card, mode="indeterminate", progress_color=COLORS["primary"])
+        self._loading_shown = False
+        
         # Stats grid
         stats_container = ctk.CTkFrame(scroll, fg_color="transparent")
         stats_container.pack(fill="x", padx=10, pady=10)
@@ -664,7 +836,7 @@ class HomeCard(ctk.CTkFrame):
         ctk.CTkLabel(
             actions_card,
             text="Quick Actions",
-            font=ctk.CTkFont(size=18, weight="bold")
+            font=font(18, "bold")
         ).pack(pady=(15, 10), padx=20, anchor="w")
         
         btn_frame = ctk.CTkFrame(actions_card, fg_color="transparent")
@@ -678,7 +850,7 @@ class HomeCard(ctk.CTkFrame):
             fg_color=COLORS["primary"],
             hover_color=COLORS["primary_hover"],
             corner_radius=10,
-            font=ctk.CTkFont(size=14, weight="bold")
+            font=font(14, "bold")
         ).pack(side="left", expand=True, padx=(0, 5))
         
         ctk.CTkButton(
@@ -691,7 +863,7 @@ class HomeCard(ctk.CTkFrame):
             border_color=COLORS["primary"],
             hover_color=COLORS["bg_dark"],
             corner_radius=10,
-            font=ctk.CTkFont(size=14)
+            font=font(14)
         ).pack(side="left", expand=True, padx=(5, 0))
         
         # Recent tasks
@@ -701,12 +873,15 @@ class HomeCard(ctk.CTkFrame):
         ctk.CTkLabel(
             recent_card,
             text="Recent Tasks",
-            font=ctk.CTkFont(size=18, weight="bold")
+            font=font(18, "bold")
         ).pack(pady=(15, 10), padx=20, anchor="w")
         
         self.recent_frame = ctk.CTkFrame(recent_card, fg_color="transparent")
         self.recent_frame.pack(fill="both", expand=True, padx=20, pady=(0, 15))
         
+        self.lbl_recent_empty = ctk.CTkLabel(self.recent_frame, text="", text_color=COLORS["text_muted"])
+        self.recent_rows = RowPool(self.recent_frame, self._make_recent_row, self._fill_recent_row, fill="x", pady=3)
+        
         self.refresh()
     
     def _create_stat_card(self, parent, title, value, icon, color):
@@ -715,13 +890,13 @@ class HomeCard(ctk.CTkFrame):
         ctk.CTkLabel(
             card,
             text=icon,
-            font=ctk.CTkFont(size=32)
+            font=font(32)
         ).pack(pady=(15, 5))
         
         value_label = ctk.CTkLabel(
             card,
             text=value,
-            font=ctk.CTkFont(size=24, weight="bold"),
+            font=font(24, "bold"),
             text_color=color
         )
         value_label.pack()
@@ -729,92 +904,120 @@ class HomeCard(ctk.CTkFrame):
         ctk.CTkLabel(
             card,
             text=title,
-            font=ctk.CTkFont(size=12),
+            font=font(12),
             text_color=COLORS["text_muted"]
         ).pack(pady=(0, 15))
         
         card.value_label = value_label
         return card
     
+    def _set_loading(self, on):
+        if on and not self._loading_shown:
+            self.loading_bar.pack(fill="x", padx=40, pady=(0, 20))
+            self.loading_bar.start()
+        elif not on and self._loading_shown:
+            self.loading_bar.stop()
+            self.loading_bar.pack_forget()
+        self._loading_shown = on
+    
+    def _show_preview(self, username, todays):
+        self.lbl_welcome.configure(text=f"Welcome back, {username}! 👋")
+        self.stat_cards["score"].value_label.configure(text="…")
+        if todays is None:
+            for card in self.stat_cards.values():
+                card.value_label.configure(text="…")
+            self._render_recent(None)
+            return
+        a = Analytics.from_tasks(todays)
+        self.stat_cards["tasks"].value_label.configure(text=str(a.task_count))
+        self.stat_cards["hours"].value_label.configure(text=f"{a.total_hours:.1f}h")
+        self._render_recent(todays[-6:])
+    
     def refresh(self):
         user = self.dashboard.user
+        preview = self.dashboard.preview
+        self._set_loading(not user and preview is not None)
+        if not user and preview:
+            self._show_preview(*preview)
+            return
         if not user:
             self.lbl_welcome.configure(text="Welcome! Please login.")
             for card in self.stat_cards.values():
                 card.value_label.configure(text="—")
-            for w in self.recent_frame.winfo_children():
-                w.destroy()
-            ctk.CTkLabel(
-                self.recent_frame,
-                text="Not logged in",
-                text_color=COLORS["text_muted"]
-            ).pack(pady=20)
+            self._render_recent([], "Not logged in")
             return
         
         self.lbl_welcome.configure(text=f"Welcome back, {user.username}! 👋")
         
         today = date.today()
         try:
-            todays = user.tasks_on_date(today)
+            todays = user.analytics(today, today)
+            self.stat_cards["tasks"].value_label.configure(text=str(todays.task_count))
+            self.stat_cards["hours"].value_label.configure(text=f"{todays.total_hours:.1f}h")
         except Exception:
-            todays = []
-        
-        total_today_hours = sum(t.hours for t in todays)
-        self.stat_cards["tasks"].value_label.configure(text=str(len(todays)))
-        self.stat_cards["hours"].value_label.configure(text=f"{total_today_hours:.1f}h")
+            self.stat_cards["tasks"].value_label.configure(text="0")
+            self.stat_cards["hours"].value_label.configure(text="0.0h")
         
         try:
-            score = user.productivity_score()
+            score = user.analytics().productivity_score
             self.stat_cards["score"].value_label.configure(text=f"{score:.0f}%")
         except Exception:
             self.stat_cards["score"].value_label.configure(text="—")
         
-        for w in self.recent_frame.winfo_children():
-            w.destroy()
+        self._render_recent(user.tasks[-6:])
         
-        recent = list(user.tasks)[-6:] if getattr(user, "tasks", None) else []
-        if not recent:
-            ctk.CTkLabel(
-                self.recent_frame,
-                text="No tasks yet. Start by adding one!",
-                text_color=COLORS["text_muted"]
-            ).pack(pady=20)
+        self.lbl_quote.configure(text=random.choice(QUOTES))
+    
+    def _render_recent(self, recent, empty_text="No tasks yet. Start by adding one!"):
+        """Rows for recent (oldest first); None while the tasks are still loading."""
+        if recent is None:
+            recent, empty_text = [], "Loading your tasks…"
+        self.recent_rows.show(reversed(recent))
+        if recent:
+            self.lbl_recent_empty.pack_forget()
         else:
-            for t in reversed(recent):
-                task_frame = ctk.CTkFrame(self.recent_frame, fg_color=COLORS["bg_dark"], corner_radius=8)
-                task_frame.pack(fill="x", pady=3)
-                
-                status = "✅" if t.completed else "⏳"
-                status_color = COLORS["success"] if t.completed else COLORS["warning"]
-                
-                left_frame = ctk.CTkFrame(task_frame, fg_color="transparent")
-                left_frame.pack(side="left", fill="x", expand=True, padx=15, pady=10)
-                
-                ctk.CTkLabel(
-                    left_frame,
-                    text=f"{status} {t.name}",
-                    font=ctk.CTkFont(size=13, weight="bold"),
-                    anchor="w"
-                ).pack(side="left")
-                
-                right_frame = ctk.CTkFrame(task_frame, fg_color="transparent")
-                right_frame.pack(side="right", padx=15, pady=10)
-                
-                ctk.CTkLabel(
-                    right_frame,
-                    text=f"{t.category}",
-                    font=ctk.CTkFont(size=11),
-                    text_color=COLORS["text_muted"]
-                ).pack(side="left", padx=5)
-                
-                ctk.CTkLabel(
-                    right_frame,
-                    text=f"{t.hours:.1f}h",
-                    font=ctk.CTkFont(size=11, weight="bold"),
-                    text_color=status_color
-                ).pack(side="left", padx=5)
+            self.lbl_recent_empty.configure(text=empty_text)
+            self.lbl_recent_empty.pack(pady=20)
+    
+    def _make_recent_row(self, parent):
+        task_frame = ctk.CTkFrame(parent, fg_color=COLORS["bg_dark"], corner_radius=8)
         
-        self.lbl_quote.configure(text=random.choice(QUOTES))
+        left_frame = ctk.CTkFrame(task_frame, fg_color="transparent")
+        left_frame.pack(side="left", fill="x", expand=True, padx=15, pady=10)
+        
+        task_frame.lbl_name = ctk.CTkLabel(
+            left_frame,
+            text="",
+            font=font(13, "bold"),
+            anchor="w"
+        )
+        task_frame.lbl_name.pack(side="left")
+        
+        right_frame = ctk.CTkFrame(task_frame, fg_color="transparent")
+        right_frame.pack(side="right", padx=15, pady=10)
+        
+        task_frame.lbl_category = ctk.CTkLabel(
+            right_frame,
+            text="",
+            font=font(11),
+            text_color=COLORS["text_muted"]
+        )
+        task_frame.lbl_category.pack(side="left", padx=5)
+        
+        task_frame.lbl_hours = ctk.CTkLabel(
+            right_frame,
+            text="",
+            font=font(11, "bold")
+        )
+        task_frame.lbl_hours.pack(side="left", padx=5)
+        return task_frame
+    
+    def _fill_recent_row(self, row, t):
+        status = "✅" if t.completed else "⏳"
+        status_color = COLORS["success"] if t.completed else COLORS["warning"]
+        row.lbl_name.configure(text=f"{status} {t.name}")
+        row.lbl_category.configure(text=f"{t.category}")
+        row.lbl_hours.configure(text=f"{t.hours:.1f}h", text_color=status_color)
 
 class AddTaskCard(ctk.CTkFrame):
     def __init__(self, parent, dashboard: DashboardPage):
@@ -831,13 +1034,13 @@ class AddTaskCard(ctk.CTkFrame):
         ctk.CTkLabel(
             self.card,
             text="➕ Add New Task",
-            font=ctk.CTkFont(size=24, weight="bold")
+            font=font(24, "bold")
         ).pack(pady=(25, 5))
         
         ctk.CTkLabel(
             self.card,
             text="Create a new task to track your productivity",
-            font=ctk.CTkFont(size=12),
+            font=font(12),
             text_color=COLORS["text_muted"]
         ).pack(pady=(0, 20))
         
@@ -848,7 +1051,7 @@ class AddTaskCard(ctk.CTkFrame):
         ctk.CTkLabel(
             form,
             text="Task Name",
-            font=ctk.CTkFont(size=13, weight="bold"),
+            font=font(13, "bold"),
             anchor="w"
         ).pack(fill="x", pady=(10, 5))
         
@@ -865,7 +1068,7 @@ class AddTaskCard(ctk.CTkFrame):
         ctk.CTkLabel(
             form,
             text="Category",
-            font=ctk.CTkFont(size=13, weight="bold"),
+            font=font(13, "bold"),
             anchor="w"
         ).pack(fill="x", pady=(15, 5))
         
@@ -890,7 +1093,7 @@ class AddTaskCard(ctk.CTkFrame):
         ctk.CTkLabel(
             hours_frame,
             text="Hours",
-            font=ctk.CTkFont(size=13, weight="bold"),
+            font=font(13, "bold"),
             anchor="w"
         ).pack(fill="x", pady=(0, 5))
         
@@ -910,7 +1113,7 @@ class AddTaskCard(ctk.CTkFrame):
         ctk.CTkLabel(
             date_frame,
             text="Date",
-            font=ctk.CTkFont(size=13, weight="bold"),
+            font=font(13, "bold"),
             anchor="w"
         ).pack(fill="x", pady=(0, 5))
         
@@ -928,7 +1131,7 @@ class AddTaskCard(ctk.CTkFrame):
         self.chk_completed = ctk.CTkCheckBox(
             form,
             text="Mark as completed",
-            font=ctk.CTkFont(size=13),
+            font=font(13),
             checkbox_height=24,
             checkbox_width=24
         )
@@ -940,7 +1143,7 @@ class AddTaskCard(ctk.CTkFrame):
             text="✅ Add Task",
             height=50,
             command=self.add_task,
-            font=ctk.CTkFont(size=15, weight="bold"),
+            font=font(15, "bold"),
             fg_color=COLORS["success"],
             hover_color="#059669",
             corner_radius=12
@@ -967,10 +1170,8 @@ class AddTaskCard(ctk.CTkFrame):
         except:
             date_s = today_iso()
         
-        t = Task(name, cat, hours, completed, date_s)
-        
         try:
-            self.dashboard.user.add_task(t)
+            self.dashboard.user.add_task(Task(name, cat, hours, completed, date_s))
             messagebox.showinfo("Success", "Task added successfully! ✅")
         except Exception as e:
             messagebox.showerror("Error", f"Could not add task: {e}")
@@ -983,16 +1184,33 @@ class AddTaskCard(ctk.CTkFrame):
         self.e_date.delete(0, "end")
         self.e_date.insert(0, today_iso())
         self.chk_completed.deselect()
-        
-        # Refresh other pages
-        for page_name in ["TasksCard", "AnalyticsCard", "VisualizeCard", "HomeCard"]:
-            self.dashboard.pages[page_name].refresh()
 
 class TasksCard(ctk.CTkFrame):
+    # rows put in the tree at a time; the next batch is added when the list is scrolled near its end
+    PAGE_SIZE = 200
+    HEADINGS = {"date": "Date", "name": "Task", "category": "Category", "hours": "Hours", "status": "Status"}
+    SORT_KEYS = {
+        "date": lambda t: t.date,
+        "name": lambda t: t.name.lower(),
+        "category": lambda t: t.category.lower(),
+        "hours": lambda t: t.hours,
+        "status": lambda t: t.completed,
+    }
+    
     def __init__(self, parent, dashboard: DashboardPage):
         super().__init__(parent, fg_color="transparent")
         self.dashboard = dashboard
         
+        self._order = []  # ids of the tasks in view, filtered and sorted
+        self._shown = 0  # how many of them are in the tree so far
+        self._sort_col = None
+        self._sort_reverse = False
+        self._generation = 0  # results of superseded background sorts are dropped
+        self._applied = 0  # generation currently in the tree
+        self._query = ""
+        self._search_job = None
+        self._more_scheduled = False
+        
         # Main card
         main_card = ctk.CTkFrame(self, corner_radius=20, fg_color=COLORS["bg_card"])
         main_card.pack(fill="both", expand=True, padx=15, pady=15)
@@ -1004,9 +1222,17 @@ class TasksCard(ctk.CTkFrame):
         ctk.CTkLabel(
             header,
             text="📋 Your Tasks",
-            font=ctk.CTkFont(size=24, weight="bold")
+            font=font(24, "bold")
         ).pack(side="left")
         
+        self.lbl_count = ctk.CTkLabel(
+            header,
+            text="",
+            font=font(12),
+            text_color=COLORS["text_muted"]
+        )
+        self.lbl_count.pack(side="left", padx=15)
+        
         ctk.CTkButton(
             header,
             text="🔄 Refresh",
@@ -1019,6 +1245,16 @@ class TasksCard(ctk.CTkFrame):
             corner_radius=8
         ).pack(side="right")
         
+        self.e_search = ctk.CTkEntry(
+            header,
+            width=220,
+            height=35,
+            placeholder_text="🔍 Filter by name or category",
+            corner_radius=8
+        )
+        self.e_search.pack(side="right", padx=10)
+        self.e_search.bind("<KeyRelease>", self._on_search)
+        
         # Tree container
         tree_container = ctk.CTkFrame(main_card, fg_color=COLORS["bg_dark"], corner_radius=12)
         tree_container.pack(fill="both", expand=True, padx=20, pady=(0, 15))
@@ -1042,14 +1278,14 @@ class TasksCard(ctk.CTkFrame):
             columns=("date", "name", "category", "hours", "status"),
             show="headings",
             height=12,
+            selectmode="extended",
             style="Custom.Treeview"
         )
+        self.tree.bind("<Control-a>", self.select_all)
+        self.tree.bind("<Delete>", lambda _e: self.delete_selected())
         
-        self.tree.heading("date", text="Date")
-        self.tree.heading("name", text="Task")
-        self.tree.heading("category", text="Category")
-        self.tree.heading("hours", text="Hours")
-        self.tree.heading("status", text="Status")
+        for col, title in self.HEADINGS.items():
+            self.tree.heading(col, text=title, command=lambda c=col: self.sort_by(c))
         
         self.tree.column("date", width=120, anchor="center")
         self.tree.column("name", width=350, anchor="w")
@@ -1057,11 +1293,11 @@ class TasksCard(ctk.CTkFrame):
         self.tree.column("hours", width=100, anchor="center")
         self.tree.column("status", width=120, anchor="center")
         
-        vsb = ttk.Scrollbar(tree_container, orient="vertical", command=self.tree.yview)
-        self.tree.configure(yscrollcommand=vsb.set)
+        self.vsb = ttk.Scrollbar(tree_container, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=self._on_tree_scroll)
         
         self.tree.pack(side="left", fill="both", expand=True, padx=10, pady=10)
-        vsb.pack(side="right", fill="y", pady=10)
+        self.vsb.pack(side="right", fill="y", pady=10)
         
         # Action buttons
         btn_frame = ctk.CTkFrame(main_card, fg_color="transparent")
@@ -1075,7 +1311,7 @@ class TasksCard(ctk.CTkFrame):
             fg_color=COLORS["success"],
             hover_color="#059669",
             corner_radius=10,
-            font=ctk.CTkFont(size=13)
+            font=font(13)
         ).pack(side="left", expand=True, padx=3)
         
         ctk.CTkButton(
@@ -1086,7 +1322,18 @@ class TasksCard(ctk.CTkFrame):
             fg_color=COLORS["warning"],
             hover_color="#d97706",
             corner_radius=10,
-            font=ctk.CTkFont(size=13)
+            font=font(13)
+        ).pack(side="left", expand=True, padx=3)
+        
+        ctk.CTkButton(
+            btn_frame,
+            text="🏷️ Set Category",
+            command=self.recategorize_selected,
+            height=40,
+            fg_color=COLORS["primary"],
+            hover_color=COLORS["primary_hover"],
+            corner_radius=10,
+            font=font(13)
         ).pack(side="left", expand=True, padx=3)
         
         ctk.CTkButton(
@@ -1097,90 +1344,212 @@ class TasksCard(ctk.CTkFrame):
             fg_color=COLORS["danger"],
             hover_color="#dc2626",
             corner_radius=10,
-            font=ctk.CTkFont(size=13)
+            font=font(13)
         ).pack(side="left", expand=True, padx=3)
         
         self.refresh()
     
     def refresh(self):
-        for r in self.tree.get_children():
-            self.tree.delete(r)
-        
-        if not self.dashboard.user:
+        """Filter and sort on a worker thread; the tree is refilled when the order arrives."""
+        self._generation += 1
+        user = self.dashboard.user
+        if not user:
+            self._apply_order(self._generation, [])
+            return
+        self.lbl_count.configure(text="Loading…")
+        self._query = self.e_search.get().strip().lower()
+        threading.Thread(
+            target=self._compute_order,
+            args=(self._generation, list(user.tasks), self._query, self._sort_col, self._sort_reverse),
+            daemon=True
+        ).start()
+    
+    def _compute_order(self, generation, tasks, query, sort_col, reverse):
+        # worker thread: works on its own snapshot of the task list
+        if query:
+            tasks = [t for t in tasks if self._matches(t, query)]
+        if sort_col:
+            tasks.sort(key=self.SORT_KEYS[sort_col], reverse=reverse)
+        self.dashboard.app.call_soon(self._apply_order, generation, [t.id for t in tasks])
+    
+    def _apply_order(self, generation, order):
+        if generation != self._generation:
+            return
+        self._applied = generation
+        self._order = order
+        self._shown = 0
+        rows = self.tree.get_children()
+        if rows:
+            self.tree.delete(*rows)
+        self._load_more()
+    
+    def _load_more(self):
+        self._more_scheduled = False
+        user = self.dashboard.user
+        end = min(self._shown + self.PAGE_SIZE, len(self._order))
+        for tid in self._order[self._shown:end]:
+            t = user.get_task(tid) if user else None
+            if t is not None:
+                self.tree.insert("", "end", iid=tid, values=self._row_values(t))
+        self._shown = end
+        self._update_count()
+    
+    @staticmethod
+    def _matches(t, query):
+        return query in t.name.lower() or query in t.category.lower()
+    
+    def apply_change(self, event, task):
+        """Patch the rows for one User change; False asks the dashboard for a full refresh."""
+        if self._applied != self._generation:
+            return False  # an order is being computed and may not include this change
+        if event == "update":
+            # the row keeps its place until the next refresh, even if sorting would move it
+            if self.tree.exists(task.id):
+                self.tree.item(task.id, values=self._row_values(task))
+            return True
+        if event == "delete":
+            if self.tree.exists(task.id):
+                self.tree.delete(task.id)
+                self._shown -= 1
+            try:
+                self._order.remove(task.id)
+            except ValueError:
+                pass  # filtered out of this view
+            self._update_count()
+            return True
+        if event == "add":
+            if self._sort_col is not None:
+                return False
+            if self._query and not self._matches(task, self._query):
+                return True
+            # unsorted views follow insertion order, so a new task belongs at the end
+            all_shown = self._shown == len(self._order)
+            self._order.append(task.id)
+            if all_shown:
+                self.tree.insert("", "end", iid=task.id, values=self._row_values(task))
+                self._shown += 1
+            self._update_count()
+            return True
+        return False
+    
+    def _update_count(self):
+        if self._shown < len(self._order):
+            self.lbl_count.configure(text=f"showing {self._shown:,} of {len(self._order):,}")
+        else:
+            self.lbl_count.configure(text=f"{len(self._order):,} tasks")
+    
+    def _on_tree_scroll(self, first, last):
+        self.vsb.set(first, last)
+        if float(last) > 0.9 and self._shown < len(self._order) and not self._more_scheduled:
+            self._more_scheduled = True
+            self.after_idle(self._load_more)
+    
+    def _on_search(self, _event=None):
+        # wait for a pause in typing before filtering
+        if self._search_job is not None:
+            self.after_cancel(self._search_job)
+        self._search_job = self.after(250, self._run_search)
+    
+    def _run_search(self):
+        self._search_job = None
+        self.refresh()
+    
+    def sort_by(self, col):
+        if self._sort_col == col:
+            self._sort_reverse = not self._sort_reverse
+        else:
+            self._sort_col, self._sort_reverse = col, False
+        for c, title in self.HEADINGS.items():
+            arrow = (" ▼" if self._sort_reverse else " ▲") if c == col else ""
+            self.tree.heading(c, text=title + arrow)
+        self.refresh()
+    
+    def _row_values(self, t):
+        status = "✅ Done" if t.completed else "⏳ Pending"
+        return (t.date.isoformat(), t.name, t.category, f"{t.hours:.2f}", status)
+    
+    def _selected_ids(self):
+        return list(self.tree.selection())
+    
+    def select_all(self, _event=None):
+        # rows not paged into the tree yet are not selectable
+        self.tree.selection_set(self.tree.get_children())
+        return "break"
+    
+    def _update_selected(self, ids, **fields):
+        user = self.dashboard.user
+        if len(ids) == 1:
+            # a single change patches its row in place instead of refilling the list
+            user.update_task_by_id(ids[0], **fields)
+            return
+        # one pass, one save and one refresh for the whole selection
+        wanted = set(ids)
+        user.update_where(lambda t: t.id in wanted, **fields)
+    
+    def mark_completed(self):
+        ids = self._selected_ids()
+        if not ids:
+            messagebox.showwarning("Select", "Please select one or more tasks")
             return
         
-        for i, t in enumerate(self.dashboard.user.tasks):
-            status = "✅ Done" if t.completed else "⏳ Pending"
-            self.tree.insert(
-                "",
-                "end",
-                iid=str(i),
-                values=(t.date.isoformat(), t.name, t.category, f"{t.hours:.2f}", status)
-            )
-    
-    def _selected_index(self):
-        sel = self.tree.selection()
-        if not sel:
-            return None
         try:
-            return int(sel[0])
-        except:
-            return None
+            self._update_selected(ids, completed=True)
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed: {e}")
     
-    def mark_completed(self):
-        idx = self._selected_index()
-        if idx is None:
-            messagebox.showwarning("Select", "Please select a task")
+    def recategorize_selected(self):
+        ids = self._selected_ids()
+        if not ids:
+            messagebox.showwarning("Select", "Please select one or more tasks")
             return
         
+        noun = "task" if len(ids) == 1 else f"{len(ids)} tasks"
+        category = ctk.CTkInputDialog(title="Set Category", text=f"New category for {noun}:").get_input()
+        if not category or not category.strip():
+            return
         try:
-            self.dashboard.user.update_task(idx, completed=True)
-            self.refresh()
-            self.dashboard.pages["AnalyticsCard"].refresh()
-            self.dashboard.pages["VisualizeCard"].refresh()
-            self.dashboard.pages["HomeCard"].refresh()
-            messagebox.showinfo("Success", "Task marked as completed! ✅")
+            self._update_selected(ids, category=category.strip())
         except Exception as e:
             messagebox.showerror("Error", f"Failed: {e}")
     
     def edit_selected(self):
-        idx = self._selected_index()
-        if idx is None:
-            messagebox.showwarning("Select", "Please select a task")
+        ids = self._selected_ids()
+        if len(ids) != 1:
+            messagebox.showwarning("Select", "Please select a single task to edit")
             return
         
         try:
-            task = self.dashboard.user.tasks[idx]
-            EditTaskDialog(self, self.dashboard.user, idx, task, on_save=self.refresh)
+            task = self.dashboard.user.get_task(ids[0])
+            EditTaskDialog(self, self.dashboard.user, task)
         except Exception as e:
             messagebox.showerror("Error", f"Could not open editor: {e}")
     
     def delete_selected(self):
-        idx = self._selected_index()
-        if idx is None:
-            messagebox.showwarning("Select", "Please select a task")
+        ids = self._selected_ids()
+        if not ids:
+            messagebox.showwarning("Select", "Please select one or more tasks")
             return
         
-        if messagebox.askyesno("Delete", "Are you sure you want to delete this task?"):
+        noun = "this task" if len(ids) == 1 else f"these {len(ids)} tasks"
+        if messagebox.askyesno("Delete", f"Are you sure you want to delete {noun}?"):
+            user = self.dashboard.user
             try:
-                self.dashboard.user.delete_task(idx)
-                self.refresh()
-                self.dashboard.pages["AnalyticsCard"].refresh()
-                self.dashboard.pages["VisualizeCard"].refresh()
-                self.dashboard.pages["HomeCard"].refresh()
-                messagebox.showinfo("Success", "Task deleted successfully")
+                if len(ids) == 1:
+                    user.delete_task_by_id(ids[0])
+                else:
+                    user.delete_tasks(ids)
             except Exception as e:
                 messagebox.showerror("Error", f"Delete failed: {e}")
 
 class EditTaskDialog(ctk.CTkToplevel):
-    def __init__(self, parent, user: User, idx: int, task: Task, on_save=None):
+    def __init__(self, parent, user: User, task: Task, on_save=None):
         super().__init__(parent)
         self.title("Edit Task")
         self.geometry("550x450")
         self.resizable(False, False)
         
         self.user = user
-        self.idx = idx
+        self.task_id = task.id
         self.on_save = on_save
         
         # Main frame
@@ -1190,20 +1559,20 @@ class EditTaskDialog(ctk.CTkToplevel):
         ctk.CTkLabel(
             main,
             text="✏️ Edit Task",
-            font=ctk.CTkFont(size=22, weight="bold")
+            font=font(22, "bold")
         ).pack(pady=(20, 20))
         
         form = ctk.CTkFrame(main, fg_color="transparent")
         form.pack(fill="both", expand=True, padx=30, pady=(0, 20))
         
         # Name
-        ctk.CTkLabel(form, text="Task Name", font=ctk.CTkFont(size=12, weight="bold"), anchor="w").pack(fill="x", pady=(0, 5))
+        ctk.CTkLabel(form, text="Task Name", font=font(12, "bold"), anchor="w").pack(fill="x", pady=(0, 5))
         self.e_name = ctk.CTkEntry(form, height=40, border_width=2, corner_radius=8)
         self.e_name.pack(fill="x", pady=(0, 15))
         self.e_name.insert(0, task.name)
         
         # Category
-        ctk.CTkLabel(form, text="Category", font=ctk.CTkFont(size=12, weight="bold"), anchor="w").pack(fill="x", pady=(0, 5))
+        ctk.CTkLabel(form, text="Category", font=font(12, "bold"), anchor="w").pack(fill="x", pady=(0, 5))
         self.e_cat = ctk.CTkEntry(form, height=40, border_width=2, corner_radius=8)
         self.e_cat.pack(fill="x", pady=(0, 15))
         self.e_cat.insert(0, task.category)
@@ -1215,20 +1584,20 @@ class EditTaskDialog(ctk.CTkToplevel):
         
         hours_f = ctk.CTkFrame(row, fg_color="transparent")
         hours_f.grid(row=0, column=0, sticky="ew", padx=(0, 10))
-        ctk.CTkLabel(hours_f, text="Hours", font=ctk.CTkFont(size=12, weight="bold"), anchor="w").pack(fill="x", pady=(0, 5))
+        ctk.CTkLabel(hours_f, text="Hours", font=font(12, "bold"), anchor="w").pack(fill="x", pady=(0, 5))
         self.e_hours = ctk.CTkEntry(hours_f, height=40, border_width=2, corner_radius=8)
         self.e_hours.pack(fill="x")
         self.e_hours.insert(0, str(task.hours))
         
         date_f = ctk.CTkFrame(row, fg_color="transparent")
         date_f.grid(row=0, column=1, sticky="ew", padx=(10, 0))
-        ctk.CTkLabel(date_f, text="Date", font=ctk.CTkFont(size=12, weight="bold"), anchor="w").pack(fill="x", pady=(0, 5))
+        ctk.CTkLabel(date_f, text="Date", font=font(12, "bold"), anchor="w").pack(fill="x", pady=(0, 5))
         self.e_date = ctk.CTkEntry(date_f, height=40, border_width=2, corner_radius=8)
         self.e_date.pack(fill="x")
         self.e_date.insert(0, task.date.isoformat())
         
         # Completed
-        self.chk_completed = ctk.CTkCheckBox(form, text="Mark as completed", font=ctk.CTkFont(size=13), checkbox_height=22, checkbox_width=22)
+        self.chk_completed = ctk.CTkCheckBox(form, text="Mark as completed", font=font(13), checkbox_height=22, checkbox_width=22)
         self.chk_completed.pack(anchor="w", pady=(5, 20))
         if task.completed:
             self.chk_completed.select()
@@ -1245,7 +1614,7 @@ class EditTaskDialog(ctk.CTkToplevel):
             fg_color=COLORS["success"],
             hover_color="#059669",
             corner_radius=10,
-            font=ctk.CTkFont(size=14, weight="bold")
+            font=font(14, "bold")
         ).pack(side="left", expand=True, padx=(0, 5))
         
         ctk.CTkButton(
@@ -1257,7 +1626,7 @@ class EditTaskDialog(ctk.CTkToplevel):
             border_width=2,
             border_color=COLORS["text_muted"],
             corner_radius=10,
-            font=ctk.CTkFont(size=14)
+            font=font(14)
         ).pack(side="left", expand=True, padx=(5, 0))
     
     def save(self):
@@ -1279,7 +1648,7 @@ class EditTaskDialog(ctk.CTkToplevel):
             return
         
         try:
-            self.user.update_task(self.idx, name=name, category=cat, hours=hours, completed=completed, date=date_s)
+            self.user.update_task_by_id(self.task_id, name=name, category=cat, hours=hours, completed=completed, date=date_s)
             if self.on_save:
                 self.on_save()
             messagebox.showinfo("Success", "Task updated successfully!")
@@ -1302,7 +1671,7 @@ class AnalyticsCard(ctk.CTkFrame):
         ctk.CTkLabel(
             header_card,
             text="📊 Analytics Dashboard",
-            font=ctk.CTkFont(size=26, weight="bold")
+            font=font(26, "bold")
         ).pack(pady=20)
         
         # Stats grid
@@ -1319,7 +1688,7 @@ class AnalyticsCard(ctk.CTkFrame):
         ctk.CTkLabel(
             main_stats,
             text="Overall Statistics",
-            font=ctk.CTkFont(size=16, weight="bold")
+            font=font(16, "bold")
         ).pack(pady=(15, 10), padx=20, anchor="w")
         
         self.summary = ctk.CTkLabel(
@@ -1327,7 +1696,7 @@ class AnalyticsCard(ctk.CTkFrame):
             text="",
             anchor="w",
             justify="left",
-            font=ctk.CTkFont(size=13)
+            font=font(13)
         )
         self.summary.pack(fill="x", padx=20, pady=(0, 15), anchor="w")
         
@@ -1338,12 +1707,19 @@ class AnalyticsCard(ctk.CTkFrame):
         ctk.CTkLabel(
             cat_card,
             text="Category Breakdown",
-            font=ctk.CTkFont(size=16, weight="bold")
+            font=font(16, "bold")
         ).pack(pady=(15, 10), padx=20, anchor="w")
         
         self.cat_frame = ctk.CTkScrollableFrame(cat_card, height=200, fg_color="transparent")
         self.cat_frame.pack(fill="both", expand=True, padx=20, pady=(0, 15))
         
+        self.lbl_cat_empty = ctk.CTkLabel(
+            self.cat_frame,
+            text="No category data available",
+            text_color=COLORS["text_muted"]
+        )
+        self.cat_rows = RowPool(self.cat_frame, self._make_cat_row, self._fill_cat_row, fill="x", pady=4)
+        
         # Refresh button
         ctk.CTkButton(
             scroll,
@@ -1353,7 +1729,7 @@ class AnalyticsCard(ctk.CTkFrame):
             fg_color=COLORS["primary"],
             hover_color=COLORS["primary_hover"],
             corner_radius=12,
-            font=ctk.CTkFont(size=14, weight="bold")
+            font=font(14, "bold")
         ).pack(pady=15)
         
         self.refresh()
@@ -1366,11 +1742,12 @@ class AnalyticsCard(ctk.CTkFrame):
         u = self.dashboard.user
         
         try:
-            total = u.total_hours()
-            completed = u.total_productive_hours()
-            rate = u.completion_rate()
-            score = u.productivity_score()
-            avg = u.average_time_per_category()
+            a = u.analytics()
+            total = a.total_hours
+            completed = a.completed_hours
+            rate = a.completion_rate
+            score = a.productivity_score
+            avg = a.average_time_per_category
         except Exception as e:
             self.summary.configure(text=f"Analytics error: {e}")
             return
@@ -1392,35 +1769,41 @@ class AnalyticsCard(ctk.CTkFrame):
         self.summary.configure(text=txt)
         
         # Category breakdown
-        for w in self.cat_frame.winfo_children():
-            w.destroy()
-        
-        if not avg:
-            ctk.CTkLabel(
-                self.cat_frame,
-                text="No category data available",
-                text_color=COLORS["text_muted"]
-            ).pack(padx=10, pady=20)
+        self.cat_rows.show(avg.items())
+        if avg:
+            self.lbl_cat_empty.pack_forget()
         else:
-            for k, v in avg.items():
-                cat_item = ctk.CTkFrame(self.cat_frame, fg_color=COLORS["bg_dark"], corner_radius=8)
-                cat_item.pack(fill="x", pady=4)
-                
-                ctk.CTkLabel(
-                    cat_item,
-                    text=k,
-                    font=ctk.CTkFont(size=12, weight="bold"),
-                    anchor="w"
-                ).pack(side="left", padx=15, pady=10)
-                
-                ctk.CTkLabel(
-                    cat_item,
-                    text=f"{v:.2f}h avg",
-                    font=ctk.CTkFont(size=12),
-                    text_color=COLORS["primary"]
-                ).pack(side="right", padx=15, pady=10)
+            self.lbl_cat_empty.pack(padx=10, pady=20)
+    
+    def _make_cat_row(self, parent):
+        cat_item = ctk.CTkFrame(parent, fg_color=COLORS["bg_dark"], corner_radius=8)
+        
+        cat_item.lbl_name = ctk.CTkLabel(
+            cat_item,
+            text="",
+            font=font(12, "bold"),
+            anchor="w"
+        )
+        cat_item.lbl_name.pack(side="left", padx=15, pady=10)
+        
+        cat_item.lbl_avg = ctk.CTkLabel(
+            cat_item,
+            text="",
+            font=font(12),
+            text_color=COLORS["primary"]
+        )
+        cat_item.lbl_avg.pack(side="right", padx=15, pady=10)
+        return cat_item
+    
+    def _fill_cat_row(self, row, item):
+        k, v = item
+        row.lbl_name.configure(text=k)
+        row.lbl_avg.configure(text=f"{v:.2f}h avg")
 
 class VisualizeCard(ctk.CTkFrame):
+    # completed-hours window label -> days (None: whole history)
+    WINDOWS = {"30 days": 30, "90 days": 90, "1 year": 365, "All": None}
+    
     def __init__(self, parent, dashboard: DashboardPage):
         super().__init__(parent, fg_color="transparent")
         self.dashboard = dashboard
@@ -1435,7 +1818,7 @@ class VisualizeCard(ctk.CTkFrame):
         ctk.CTkLabel(
             header,
             text="📈 Data Visualization",
-            font=ctk.CTkFont(size=24, weight="bold")
+            font=font(24, "bold")
         ).pack(side="left")
         
         # Chart type buttons
@@ -1472,117 +1855,221 @@ class VisualizeCard(ctk.CTkFrame):
             corner_radius=10
         ).pack(side="left", expand=True, padx=3)
         
+        # Time window and bucket size for the completed-hours chart
+        range_frame = ctk.CTkFrame(main_card, fg_color="transparent")
+        range_frame.pack(fill="x", padx=23, pady=(0, 10))
+        
+        ctk.CTkLabel(range_frame, text="Window", font=font(12), text_color=COLORS["text_muted"]).pack(side="left", padx=(0, 6))
+        self.window_switch = ctk.CTkSegmentedButton(
+            range_frame,
+            values=list(self.WINDOWS),
+            command=lambda _v: self._replot_line(),
+            selected_color=COLORS["success"]
+        )
+        self.window_switch.set("All")
+        self.window_switch.pack(side="left")
+        
+        ctk.CTkLabel(range_frame, text="Group by", font=font(12), text_color=COLORS["text_muted"]).pack(side="left", padx=(20, 6))
+        self.freq_switch = ctk.CTkSegmentedButton(
+            range_frame,
+            values=["Auto", "Day", "Week", "Month"],
+            command=lambda _v: self._replot_line(),
+            selected_color=COLORS["success"]
+        )
+        self.freq_switch.set("Auto")
+        self.freq_switch.pack(side="left")
+        
         # Canvas holder
         self.canvas_holder = ctk.CTkFrame(main_card, fg_color=COLORS["bg_dark"], corner_radius=12)
         self.canvas_holder.pack(fill="both", expand=True, padx=20, pady=(0, 20))
         
+        self.lbl_empty = ctk.CTkLabel(
+            self.canvas_holder,
+            text="📊 No data to visualize\nAdd some tasks to see charts here!",
+            font=font(16),
+            text_color=COLORS["text_muted"]
+        )
+        
+        # one figure and canvas per chart kind, built on first use and then updated in place
+        self._charts = {}
+        self._shown_chart = None
+        # kind -> (user, data_version) the chart was last drawn for
+        self._drawn = {}
+        # kind -> (user, data_version, aggregated series)
+        self._series = {}
+        self._kind = "bar"
+        
         self.refresh()
     
     def refresh(self):
-        for w in self.canvas_holder.winfo_children():
-            w.destroy()
-        
-        if not self.dashboard.user or not getattr(self.dashboard.user, "tasks", None):
-            ctk.CTkLabel(
-                self.canvas_holder,
-                text="📊 No data to visualize\nAdd some tasks to see charts here!",
-                font=ctk.CTkFont(size=16),
-                text_color=COLORS["text_muted"]
-            ).pack(expand=True, pady=50)
+        u = self.dashboard.user
+        if not u or not u.tasks:
+            self._show_chart(None)
             return
-        
-        self.plot_bar()
+        # a line or pie chart with nothing left to show falls back to the bar chart
+        if not self._plot(self._kind, quiet=True):
+            self._plot("bar", quiet=True)
     
-    def _draw_fig(self, fig):
-        for w in self.canvas_holder.winfo_children():
-            w.destroy()
+    def _series_for(self, kind):
+        u = self.dashboard.user
+        cached = self._series.get(kind)
+        if cached and cached[0] is u and cached[1] == u.data_version:
+            return cached[2]
+        if kind == "bar":
+            series = u.hours_by_category()
+        elif kind == "line":
+            series = u.daily_completed_hours()
+        else:
+            a = u.analytics()
+            series = (a.completed_count, a.pending_count)
+        self._series[kind] = (u, u.data_version, series)
+        return series
+    
+    def _chart(self, kind):
+        chart = self._charts.get(kind)
+        if chart is not None:
+            return chart
+        fig = plt.Figure(figsize=(7, 5) if kind == "pie" else (9, 5))
+        ax = fig.add_subplot(111)
         
         # Set dark theme for matplotlib
         fig.patch.set_facecolor(COLORS["bg_dark"])
-        for ax in fig.get_axes():
-            ax.set_facecolor(COLORS["bg_dark"])
-            ax.spines['bottom'].set_color(COLORS["text_muted"])
-            ax.spines['top'].set_color(COLORS["text_muted"])
-            ax.spines['right'].set_color(COLORS["text_muted"])
-            ax.spines['left'].set_color(COLORS["text_muted"])
-            ax.tick_params(colors=COLORS["text_light"])
-            ax.xaxis.label.set_color(COLORS["text_light"])
-            ax.yaxis.label.set_color(COLORS["text_light"])
-            ax.title.set_color(COLORS["text_light"])
+        ax.set_facecolor(COLORS["bg_dark"])
+        ax.spines['bottom'].set_color(COLORS["text_muted"])
+        ax.spines['top'].set_color(COLORS["text_muted"])
+        ax.spines['right'].set_color(COLORS["text_muted"])
+        ax.spines['left'].set_color(COLORS["text_muted"])
+        ax.tick_params(colors=COLORS["text_light"])
+        ax.xaxis.label.set_color(COLORS["text_light"])
+        ax.yaxis.label.set_color(COLORS["text_light"])
+        ax.title.set_color(COLORS["text_light"])
+        
+        if kind == "bar":
+            ax.set_ylabel("Hours", fontsize=12, fontweight='bold')
+            ax.set_title("Hours by Category", fontsize=14, fontweight='bold', pad=20)
+            ax.grid(axis='y', alpha=0.3, linestyle='--')
+        elif kind == "line":
+            ax.set_ylabel("Completed Hours", fontsize=12, fontweight='bold')
+            ax.set_title("Completed Hours Over Time", fontsize=14, fontweight='bold', pad=20)
+            ax.grid(True, alpha=0.3, linestyle='--')
+            locator = mdates.AutoDateLocator()
+            ax.xaxis.set_major_locator(locator)
+            ax.xaxis.set_major_formatter(mdates.ConciseDateFormatter(locator))
         
         canvas = FigureCanvasTkAgg(fig, master=self.canvas_holder)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill="both", expand=True, padx=10, pady=10)
+        chart = self._charts[kind] = {"fig": fig, "ax": ax, "canvas": canvas}
+        return chart
     
-    def plot_bar(self):
-        u = self.dashboard.user
-        if not u or not u.tasks:
+    def _show_chart(self, kind):
+        if kind == self._shown_chart:
             return
-        
-        categories = {}
-        for t in u.tasks:
-            categories[t.category] = categories.get(t.category, 0) + t.hours
-        
-        keys = list(categories.keys())
-        vals = [categories[k] for k in keys]
-        
-        fig = plt.Figure(figsize=(9, 5))
-        ax = fig.add_subplot(111)
-        bars = ax.bar(keys, vals, color=COLORS["primary"], alpha=0.8, edgecolor='white', linewidth=1.5)
-        ax.set_ylabel("Hours", fontsize=12, fontweight='bold')
-        ax.set_title("Hours by Category", fontsize=14, fontweight='bold', pad=20)
-        ax.set_xticklabels(keys, rotation=45, ha="right")
-        ax.grid(axis='y', alpha=0.3, linestyle='--')
-        self._draw_fig(fig)
+        if self._shown_chart is None:
+            self.lbl_empty.pack_forget()
+        else:
+            self._charts[self._shown_chart]["canvas"].get_tk_widget().pack_forget()
+        if kind is None:
+            self.lbl_empty.pack(expand=True, pady=50)
+        else:
+            self._charts[kind]["canvas"].get_tk_widget().pack(fill="both", expand=True, padx=10, pady=10)
+        self._shown_chart = kind
     
-    def plot_line(self):
+    def _plot(self, kind, quiet=False):
+        """Show chart kind, redrawing it only if the user's data changed since; False if there is nothing to plot."""
         u = self.dashboard.user
-        if not u or not u.tasks:
-            return
-        
-        daily = {}
-        for t in u.tasks:
-            if t.completed:
-                key = t.date.isoformat() if hasattr(t.date, "isoformat") else str(t.date)
-                daily[key] = daily.get(key, 0) + t.hours
-        
-        if not daily:
-            messagebox.showinfo("No Data", "No completed tasks to visualize")
-            return
-        
-        items = sorted(daily.items(), key=lambda x: x[0])
-        xs = [i[0] for i in items]
-        ys = [i[1] for i in items]
-        
-        fig = plt.Figure(figsize=(9, 5))
-        ax = fig.add_subplot(111)
-        ax.plot(xs, ys, marker="o", linewidth=2.5, markersize=8, color=COLORS["success"], markerfacecolor='white', markeredgewidth=2)
-        ax.fill_between(range(len(xs)), ys, alpha=0.3, color=COLORS["success"])
-        ax.set_ylabel("Completed Hours", fontsize=12, fontweight='bold')
-        ax.set_title("Completed Hours Over Time", fontsize=14, fontweight='bold', pad=20)
-        ax.set_xticks(range(len(xs)))
-        ax.set_xticklabels(xs, rotation=45, ha="right")
-        ax.grid(True, alpha=0.3, linestyle='--')
-        fig.tight_layout()
-        self._draw_fig(fig)
+        if not u:
+            return False
+        series = self._series_for(kind)
+        if kind == "bar" and not series:
+            return False
+        if kind == "line" and not series[0]:
+            if not quiet:
+                messagebox.showinfo("No Data", "No completed tasks to visualize")
+            return False
+        if kind == "pie" and sum(series) == 0:
+            if not quiet:
+                messagebox.showinfo("No Data", "No tasks to visualize")
+            return False
+        
+        self._kind = kind
+        chart = self._chart(kind)
+        stamp = (u, u.data_version)
+        if kind == "line":
+            stamp += self._line_options()
+        if self._drawn.get(kind) != stamp:
+            getattr(self, f"_update_{kind}")(chart, series)
+            self._drawn[kind] = stamp
+            chart["canvas"].draw_idle()
+        self._show_chart(kind)
+        return True
+    
+    def _line_options(self):
+        freq = self.freq_switch.get().lower()
+        return self.WINDOWS[self.window_switch.get()], "auto" if freq == "auto" else freq
+    
+    def _replot_line(self):
+        if self._kind == "line":
+            self._plot("line")
+    
+    def plot_bar(self):
+        self._plot("bar")
+    
+    def plot_line(self):
+        self._plot("line")
     
     def plot_pie(self):
-        u = self.dashboard.user
-        if not u:
-            return
-        
-        comp = sum(1 for t in u.tasks if t.completed)
-        pend = sum(1 for t in u.tasks if not t.completed)
-        
-        if comp + pend == 0:
-            messagebox.showinfo("No Data", "No tasks to visualize")
-            return
+        self._plot("pie")
+    
+    def _update_bar(self, chart, categories):
+        ax = chart["ax"]
+        keys = list(categories.keys())
+        vals = [categories[k] for k in keys]
         
-        fig = plt.Figure(figsize=(7, 5))
-        ax = fig.add_subplot(111)
+        if chart.get("keys") == keys:
+            for rect, v in zip(chart["bars"], vals):
+                rect.set_height(v)
+        else:
+            # the set of categories changed; only then are the bars rebuilt
+            if "bars" in chart:
+                chart["bars"].remove()
+            xs = range(len(keys))
+            chart["bars"] = ax.bar(xs, vals, color=COLORS["primary"], alpha=0.8, edgecolor='white', linewidth=1.5)
+            chart["keys"] = keys
+            ax.set_xticks(xs)
+            ax.set_xticklabels(keys, rotation=45, ha="right")
+            ax.set_xlim(-0.5, len(keys) - 0.5)
+        ax.set_ylim(0, max(vals) * 1.1 or 1)
+    
+    def _update_line(self, chart, series):
+        ax = chart["ax"]
+        window_days, freq = self._line_options()
+        # bucketed and downsampled, so drawing cost does not grow with the history
+        xs, ys, freq = completed_hours_series(*series, window_days=window_days, freq=freq)
+        xs = mdates.date2num(xs)
+        
+        if "line" not in chart:
+            chart["line"], = ax.plot([], [], linewidth=2.5, markersize=8, color=COLORS["success"], markerfacecolor='white', markeredgewidth=2)
+        chart["line"].set_data(xs, ys)
+        chart["line"].set_marker("o" if len(xs) <= 60 else "")
+        if "fill" in chart:
+            chart["fill"].remove()
+        chart["fill"] = ax.fill_between(xs, ys, alpha=0.3, color=COLORS["success"])
+        
+        if len(xs):
+            title = "Completed Hours per " + freq.capitalize()
+        else:
+            title = "No completed hours in this window"
+        ax.set_title(title, fontsize=14, fontweight='bold', pad=20)
+        ax.relim()
+        ax.autoscale_view()
+        chart["fig"].tight_layout()
+    
+    def _update_pie(self, chart, series):
+        # wedge geometry has no setters worth using; redraw the pie on the same axes
+        ax = chart["ax"]
+        ax.clear()
         colors = [COLORS["success"], COLORS["warning"]]
         wedges, texts, autotexts = ax.pie(
-            [comp, pend],
+            list(series),
             labels=["Completed", "Pending"],
             autopct="%1.1f%%",
             colors=colors,
@@ -1594,9 +2081,8 @@ class VisualizeCard(ctk.CTkFrame):
         for autotext in autotexts:
             autotext.set_color('white')
         
-        ax.set_title("Task Completion Status", fontsize=14, fontweight='bold', pad=20)
-        fig.tight_layout()
-        self._draw_fig(fig)
+        ax.set_title("Task Completion Status", fontsize=14, fontweight='bold', pad=20, color=COLORS["text_light"])
+        chart["fig"].tight_layout()
 
 class BackupCard(ctk.CTkFrame):
     def __init__(self, parent, dashboard: DashboardPage):
@@ -1610,13 +2096,13 @@ class BackupCard(ctk.CTkFrame):
         ctk.CTkLabel(
             main_card,
             text="💾 Backup & Restore",
-            font=ctk.CTkFont(size=24, weight="bold")
+            font=font(24, "bold")
         ).pack(pady=(25, 10))
         
         ctk.CTkLabel(
             main_card,
             text="Protect your data by creating backups",
-            font=ctk.CTkFont(size=13),
+            font=font(13),
             text_color=COLORS["text_muted"]
         ).pack(pady=(0, 20))
         
@@ -1632,7 +2118,7 @@ class BackupCard(ctk.CTkFrame):
             fg_color=COLORS["success"],
             hover_color="#059669",
             corner_radius=12,
-            font=ctk.CTkFont(size=14, weight="bold")
+            font=font(14, "bold")
         ).pack(fill="x", pady=5)
         
         ctk.CTkButton(
@@ -1643,7 +2129,7 @@ class BackupCard(ctk.CTkFrame):
             fg_color=COLORS["warning"],
             hover_color="#d97706",
             corner_radius=12,
-            font=ctk.CTkFont(size=14, weight="bold")
+            font=font(14, "bold")
         ).pack(fill="x", pady=5)
         
         ctk.CTkButton(
@@ -1656,14 +2142,14 @@ class BackupCard(ctk.CTkFrame):
             border_color=COLORS["primary"],
             hover_color=COLORS["bg_dark"],
             corner_radius=12,
-            font=ctk.CTkFont(size=14)
+            font=font(14)
         ).pack(fill="x", pady=5)
         
         # Backup list
         ctk.CTkLabel(
             main_card,
             text="Available Backups",
-            font=ctk.CTkFont(size=16, weight="bold")
+            font=font(16, "bold")
         ).pack(pady=(10, 10), padx=30, anchor="w")
         
         list_container = ctk.CTkFrame(main_card, fg_color=COLORS["bg_dark"], corner_radius=12)
@@ -1689,7 +2175,7 @@ class BackupCard(ctk.CTkFrame):
             ctk.CTkLabel(
                 self.listbox,
                 text="📂 No backups found\nCreate your first backup!",
-                font=ctk.CTkFont(size=14),
+                font=font(14),
                 text_color=COLORS["text_muted"]
             ).pack(pady=40)
             return
@@ -1704,7 +2190,7 @@ class BackupCard(ctk.CTkFrame):
             ctk.CTkLabel(
                 info_frame,
                 text="💾 " + b,
-                font=ctk.CTkFont(size=13, weight="bold"),
+                font=font(13, "bold"),
                 anchor="w"
             ).pack(anchor="w")
             
@@ -1716,7 +2202,7 @@ class BackupCard(ctk.CTkFrame):
                 ctk.CTkLabel(
                     info_frame,
                     text=f"Size: {size_text}",
-                    font=ctk.CTkFont(size=11),
+                    font=font(11),
                     text_color=COLORS["text_muted"],
                     anchor="w"
                 ).pack(anchor="w")
@@ -1732,7 +2218,7 @@ class BackupCard(ctk.CTkFrame):
                 fg_color=COLORS["primary"],
                 hover_color=COLORS["primary_hover"],
                 corner_radius=8,
-                font=ctk.CTkFont(size=12, weight="bold")
+                font=font(12, "bold")
             ).pack(side="right", padx=15, pady=12)
     
     def create_backup(self):
@@ -1740,15 +2226,28 @@ class BackupCard(ctk.CTkFrame):
             messagebox.showwarning("No User", "Please login first")
             return
         
-        try:
-            path = self.dashboard.user.backup()
-            if path:
-                messagebox.showinfo("Success", f"✅ Backup created successfully!\n\n{os.path.basename(path)}")
-                self.refresh()
-            else:
-                messagebox.showinfo("No Data", "No tasks file to backup")
-        except Exception as e:
-            messagebox.showerror("Error", f"Backup failed: {e}")
+        user = self.dashboard.user
+        
+        def job():
+            try:
+                return user.backup(), None
+            except Exception as e:
+                return None, e
+        
+        # runs after the queued writes; clicking again before it starts does not add a second backup
+        self.dashboard.app.writer.submit(
+            ("backup", user.username), job,
+            on_done=lambda result: self.dashboard.app.call_soon(self._backup_done, *result)
+        )
+    
+    def _backup_done(self, path, error):
+        if error is not None:
+            messagebox.showerror("Error", f"Backup failed: {error}")
+        elif path:
+            messagebox.showinfo("Success", f"✅ Backup created successfully!\n\n{os.path.basename(path)}")
+            self.refresh()
+        else:
+            messagebox.showinfo("No Data", "No tasks file to backup")
     
     def restore_file(self):
         p = filedialog.askopenfilename(
@@ -1767,10 +2266,6 @@ class BackupCard(ctk.CTkFrame):
         try:
             self.dashboard.user.restore(path)
             messagebox.showinfo("Success", "✅ Data restored successfully!")
-            
-            # Refresh all pages
-            for page_name in ["TasksCard", "AnalyticsCard", "VisualizeCard", "HomeCard"]:
-                self.dashboard.pages[page_name].refresh()
         except Exception as e:
             messagebox.showerror("Error", f"Restore failed: {e}")
 
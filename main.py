@@ -1,13 +1,21 @@
+import sys
 import argparse
-from gui import run_gui
 from user_system import register, login
+from cli.batch_cli import add_batch_commands, run_batch
 
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument('--cli', action='store_true', help='Run CLI mode (text)')
+    parser.add_argument('--migrate-sqlite', action='store_true', help='Copy users.json and task files into the SQLite database')
+    add_batch_commands(parser)
     args = parser.parse_args()
 
-    if args.cli:
+    if args.command:
+        sys.exit(run_batch(args))
+    elif args.migrate_sqlite:
+        from cli.migrate_cli import migrate_to_sqlite
+        migrate_to_sqlite()
+    elif args.cli:
         # simple CLI flow
         while True:
             print('\n1) Login\n2) Register\n3) Exit')
@@ -44,7 +52,8 @@ def main():
             else:
                 print('Invalid')
     else:
-        # default: launch GUI
+        # default: launch GUI (imported here so the CLI never loads tkinter or matplotlib)
+        from gui import run_gui
         run_gui()
 
 if __name__ == '__main__':
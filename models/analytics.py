@@ -0,0 +1,45 @@
+class Analytics:
+    """Snapshot of every productivity metric over one date range."""
+
+    def __init__(self, total_hours=0.0, completed_hours=0.0, task_count=0, completed_count=0, category_sums=None, category_counts=None):
+        self.total_hours = total_hours
+        self.completed_hours = completed_hours
+        self.task_count = task_count
+        self.completed_count = completed_count
+        self.category_sums = category_sums or {}
+        self.category_counts = category_counts or {}
+
+    @property
+    def pending_count(self):
+        return self.task_count - self.completed_count
+
+    @property
+    def completion_rate(self):
+        if not self.task_count:
+            return 0.0
+        return (self.completed_count / self.task_count) * 100
+
+    @property
+    def productivity_score(self):
+        if self.total_hours == 0:
+            return 0.0
+        return (self.completed_hours / self.total_hours) * 100
+
+    @property
+    def average_time_per_category(self):
+        return {k: (self.category_sums[k] / self.category_counts[k]) for k in self.category_sums}
+
+    @staticmethod
+    def from_tasks(tasks):
+        a = Analytics()
+        sums = a.category_sums
+        counts = a.category_counts
+        for t in tasks:
+            a.task_count += 1
+            a.total_hours += t.hours
+            if t.completed:
+                a.completed_count += 1
+                a.completed_hours += t.hours
+            sums[t.category] = sums.get(t.category, 0.0) + t.hours
+            counts[t.category] = counts.get(t.category, 0) + 1
+        return a
@@ -0,0 +1,138 @@
+import numpy as np
+from .analytics import Analytics
+
+class TaskColumns:
+    """Parallel NumPy arrays mirroring User.tasks for vectorized analytics.
+
+    Rows are unordered: a removed row is filled with the last one, so add
+    and remove are both O(1).
+    """
+
+    def __init__(self, capacity=1024):
+        self.clear(capacity)
+
+    def clear(self, capacity=1024):
+        self.size = 0
+        self.ordinal = np.zeros(capacity, dtype=np.int32)
+        self.hours = np.zeros(capacity, dtype=np.float64)
+        self.completed = np.zeros(capacity, dtype=bool)
+        self.category = np.zeros(capacity, dtype=np.int32)
+        self.category_names = []
+        self._category_codes = {}
+        self._ids = []
+        self._slot = {}
+
+    # ---------- maintenance ----------
+    def _code(self, category):
+        code = self._category_codes.get(category)
+        if code is None:
+            code = len(self.category_names)
+            self._category_codes[category] = code
+            self.category_names.append(category)
+        return code
+
+    def _grow(self, needed):
+        cap = len(self.hours)
+        if needed <= cap:
+            return
+        while cap < needed:
+            cap *= 2
+        for name in ('ordinal', 'hours', 'completed', 'category'):
+            old = getattr(self, name)
+            new = np.zeros(cap, dtype=old.dtype)
+            new[:self.size] = old[:self.size]
+            setattr(self, name, new)
+
+    def build(self, tasks):
+        n = len(tasks)
+        self.clear(max(n, 1024))
+        self.ordinal[:n] = np.fromiter((t.date.toordinal() for t in tasks), dtype=np.int32, count=n)
+        self.hours[:n] = np.fromiter((t.hours for t in tasks), dtype=np.float64, count=n)
+        self.completed[:n] = np.fromiter((t.completed for t in tasks), dtype=bool, count=n)
+        self.category[:n] = np.fromiter((self._code(t.category) for t in tasks), dtype=np.int32, count=n)
+        self._set_ids([t.id for t in tasks])
+
+    def build_arrays(self, ordinal, hours, completed, category_codes, category_names, ids):
+        """Fill from ready-made columns; category_codes index into category_names."""
+        n = len(ids)
+        self.clear(max(n, 1024))
+        self.ordinal[:n] = ordinal
+        self.hours[:n] = hours
+        self.completed[:n] = completed
+        self.category[:n] = category_codes
+        for name in category_names:
+            self._code(name)
+        self._set_ids(list(ids))
+
+    def _set_ids(self, ids):
+        self._ids = ids
+        self._slot = {tid: i for i, tid in enumerate(ids)}
+        self.size = len(ids)
+
+    def add(self, task):
+        self._grow(self.size + 1)
+        i = self.size
+        self._write(i, task)
+        self._ids.append(task.id)
+        self._slot[task.id] = i
+        self.size += 1
+
+    def remove(self, task):
+        i = self._slot.pop(task.id)
+        last = self.size - 1
+        if i != last:
+            for arr in (self.ordinal, self.hours, self.completed, self.category):
+                arr[i] = arr[last]
+            moved = self._ids[last]
+            self._ids[i] = moved
+            self._slot[moved] = i
+        self._ids.pop()
+        self.size = last
+
+    def _write(self, i, task):
+        self.ordinal[i] = task.date.toordinal()
+        self.hours[i] = task.hours
+        self.completed[i] = task.completed
+        self.category[i] = self._code(task.category)
+
+    # ---------- queries ----------
+    def _range_mask(self, start=None, end=None):
+        if start is None or end is None:
+            return None
+        o = self.ordinal[:self.size]
+        return (o >= start.toordinal()) & (o <= end.toordinal())
+
+    def analytics(self, start=None, end=None):
+        n = self.size
+        hours = self.hours[:n]
+        completed = self.completed[:n]
+        category = self.category[:n]
+        mask = self._range_mask(start, end)
+        if mask is not None:
+            hours = hours[mask]
+            completed = completed[mask]
+            category = category[mask]
+        ncat = len(self.category_names)
+        sums = np.bincount(category, weights=hours, minlength=ncat)
+        counts = np.bincount(category, minlength=ncat)
+        present = np.flatnonzero(counts)
+        return Analytics(
+            float(hours.sum()),
+            float(hours[completed].sum()),
+            int(hours.size),
+            int(np.count_nonzero(completed)),
+            {self.category_names[c]: float(sums[c]) for c in present},
+            {self.category_names[c]: int(counts[c]) for c in present},
+        )
+
+    def daily_series(self, completed_only=True):
+        """Sorted (ordinals, hours per day) arrays."""
+        n = self.size
+        ordinal = self.ordinal[:n]
+        hours = self.hours[:n]
+        if completed_only:
+            mask = self.completed[:n]
+            ordinal = ordinal[mask]
+            hours = hours[mask]
+        days, inverse = np.unique(ordinal, return_inverse=True)
+        return days, np.bincount(inverse, weights=hours, minlength=days.size)
@@ -0,0 +1,96 @@
+import threading
+from collections import deque
+
+class PersistenceWorker:
+    """Write-behind thread for User persistence.
+
+    Journal records are queued and written in order, with runs of queued
+    records going to disk as one append. Keyed jobs (compaction, backup) are
+    coalesced: submitting a key that is still queued replaces that job's
+    function in place. Errors go to on_error(exc), called on the worker thread.
+    """
+
+    def __init__(self, on_error=None):
+        self.on_error = on_error
+        self._cond = threading.Condition()
+        # entries are ['record', storage, record] or ['job', key, fn, on_done]
+        self._queue = deque()
+        self._jobs = {}
+        self._busy = False
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name='focusflow-persistence', daemon=True)
+        self._thread.start()
+
+    # ---------- producer side ----------
+    def append(self, storage, record):
+        with self._cond:
+            self._queue.append(['record', storage, record])
+            self._cond.notify()
+
+    def submit(self, key, fn, on_done=None):
+        """Run fn() on the worker thread; on_done(result) is called there afterwards."""
+        with self._cond:
+            entry = self._jobs.get(key)
+            if entry is not None:
+                entry[2], entry[3] = fn, on_done
+                return
+            entry = ['job', key, fn, on_done]
+            self._jobs[key] = entry
+            self._queue.append(entry)
+            self._cond.notify()
+
+    def pending(self):
+        with self._cond:
+            return bool(self._queue) or self._busy
+
+    def flush(self, timeout=None):
+        """Block until everything queued so far is written; returns False on timeout."""
+        if threading.current_thread() is self._thread:
+            return True
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._queue and not self._busy, timeout)
+
+    def stop(self, timeout=None):
+        self.flush(timeout)
+        with self._cond:
+            self._stopping = True
+            self._cond.notify()
+        self._thread.join(timeout)
+
+    # ---------- worker side ----------
+    def _next_batch(self):
+        """The next job, or the longest run of queued records for one storage."""
+        first = self._queue.popleft()
+        if first[0] == 'job':
+            del self._jobs[first[1]]
+            return first
+        storage = first[1]
+        records = [first[2]]
+        while self._queue and self._queue[0][0] == 'record' and self._queue[0][1] is storage:
+            records.append(self._queue.popleft()[2])
+        return ['records', storage, records]
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._queue or self._stopping)
+                if not self._queue:
+                    return
+                batch = self._next_batch()
+                self._busy = True
+            try:
+                if batch[0] == 'records':
+                    batch[1].append_many(batch[2])
+                else:
+                    result = batch[2]()
+                    if batch[3] is not None:
+                        batch[3](result)
+            except Exception as e:
+                if self.on_error is not None:
+                    self.on_error(e)
+                else:
+                    print('Error saving tasks:', e)
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()
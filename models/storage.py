@@ -0,0 +1,526 @@
+import os
+import io
+import csv
+import json
+import shutil
+import sqlite3
+from datetime import date
+from .task import Task
+from .analytics import Analytics
+from utils.paths import DATA_DIR, STORAGE_BACKEND, DB_FILE, ensure_data_dir
+from utils.fileio import atomic_write, file_lock, file_signature
+
+# only the binary backend needs numpy; it is imported when that backend is first used
+np = None
+
+def _read_csv_rows(path):
+    """Every non-empty row of a CSV file, read in one go."""
+    with open(path, 'r', newline='', encoding='utf-8') as f:
+        text = f.read()
+    if '"' not in text and text.count('\r') == text.count('\r\n'):
+        # nothing is quoted and rows end in csv.writer's '\r\n' (or '\n'), so a plain split is
+        # exact and much faster than csv.reader; str.splitlines() would also break on characters
+        # such as U+2028 or '\x0c' that csv.writer leaves unquoted inside a field
+        return [line.split(',') for line in text.replace('\r\n', '\n').split('\n') if line]
+    return [row for row in csv.reader(io.StringIO(text)) if row]
+
+def write_csv(path, tasks):
+    with atomic_write(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        for t in tasks:
+            writer.writerow(t.to_csv_row())
+
+def read_csv(path):
+    """(tasks, missing_ids) from a tasks CSV; missing_ids is True for files written before task ids."""
+    rows = _read_csv_rows(path)
+    return Task.from_csv_rows(rows), any(len(row) < 6 for row in rows)
+
+
+class FileStorage:
+    """A base file holding a snapshot of the tasks plus an append-only journal.
+
+    Journal records are CSV rows: ['A', *task row], ['U', *task row] or ['D', id].
+    Subclasses only decide how the base file is laid out.
+
+    Writers hold an advisory lock on the base file. The base file is always
+    replaced atomically and replaying a journal is idempotent, so a crash
+    between rewriting the base and dropping the journal loses nothing.
+    """
+
+    extension = None
+    # True when iter_tasks(start, end) skips other dates without parsing them
+    range_scan_is_cheap = False
+
+    def __init__(self, username):
+        ensure_data_dir()
+        self.username = username
+        self.path = os.path.join(DATA_DIR, f"tasks_{username}{self.extension}")
+        self.journal_path = self.path + '.journal'
+        self.journal_len = 0
+        self._signature = None
+        # set when a write found that someone else had written first: the caller's copy is behind
+        self.stale = False
+
+    # ---------- concurrency ----------
+    def locked(self):
+        """Exclusive lock against other threads and processes using the same files."""
+        return file_lock(self.path)
+
+    def mark_synced(self):
+        """Remember the on-disk state that the caller's in-memory copy matches."""
+        self._signature = file_signature(self.path, self.journal_path)
+        self.stale = False
+
+    def changed_on_disk(self):
+        """True if someone else wrote the files since the last mark_synced()."""
+        return file_signature(self.path, self.journal_path) != self._signature
+
+    # ---------- base file ----------
+    def exists(self):
+        return os.path.exists(self.path)
+
+    def read_tasks(self):
+        """(tasks, missing_ids) stored in the base file."""
+        raise NotImplementedError
+
+    def _write_base(self, tasks):
+        raise NotImplementedError
+
+    def _scan(self, start, end, skip):
+        """Base tasks dated start..end whose id is not in skip, without building the others."""
+        raise NotImplementedError
+
+    def build_columns(self, columns, tasks):
+        columns.build(tasks)
+
+    def write_tasks(self, tasks):
+        """Replace the base file with tasks and drop the journal it now covers."""
+        with self.locked():
+            self._write_base(tasks)
+            self.clear_journal()
+            self.mark_synced()
+
+    # ---------- journal ----------
+    def append(self, record):
+        self.append_many([record])
+
+    def append_many(self, records):
+        with self.locked():
+            if self.changed_on_disk():
+                # the records still apply on top of the other writer's, but memory no longer matches
+                self.stale = True
+            torn = self._journal_torn()
+            with open(self.journal_path, 'a', newline='', encoding='utf-8') as f:
+                if torn:
+                    # end the record a crash cut short, so it does not swallow the first new one
+                    f.write('\r\n')
+                csv.writer(f).writerows(records)
+            self.journal_len += len(records)
+            self._signature = file_signature(self.path, self.journal_path)
+
+    def _journal_torn(self):
+        """True if the journal does not end in a line terminator (a crash mid-append)."""
+        try:
+            with open(self.journal_path, 'rb') as f:
+                f.seek(-1, os.SEEK_END)
+                return f.read(1) not in (b'\n', b'\r')
+        except OSError:  # missing or empty
+            return False
+
+    def read_journal(self):
+        self.journal_len = 0
+        if not os.path.exists(self.journal_path):
+            return
+        with open(self.journal_path, 'r', newline='', encoding='utf-8') as f:
+            for rec in csv.reader(f):
+                if rec:
+                    self.journal_len += 1
+                    yield rec
+
+    def clear_journal(self):
+        if os.path.exists(self.journal_path):
+            os.remove(self.journal_path)
+        self.journal_len = 0
+
+    def journal_overlay(self):
+        """Latest journalled version of each touched task, plus the ids deleted since the base file."""
+        changed, deleted = {}, set()
+        for rec in self.read_journal():
+            if rec[0] in ('A', 'U'):
+                try:
+                    t = Task.from_csv_row(rec[1:])
+                except (ValueError, IndexError):
+                    continue  # a torn record; User.load_tasks reports it
+                changed[t.id] = t
+                deleted.discard(t.id)
+            elif rec[0] == 'D' and len(rec) > 1:
+                changed.pop(rec[1], None)
+                deleted.add(rec[1])
+        return changed, deleted
+
+    def iter_tasks(self, start=None, end=None):
+        """Stream tasks dated start..end (dates, inclusive, None for open) with the journal applied.
+
+        Journalled changes come after the untouched base tasks.
+        """
+        changed, deleted = self.journal_overlay()
+        yield from self._scan(start, end, changed.keys() | deleted)
+        for t in changed.values():
+            if (start is None or t.date >= start) and (end is None or t.date <= end):
+                yield t
+
+    # ---------- CSV import / export ----------
+    def export_csv(self, path):
+        write_csv(path, self.read_tasks()[0])
+
+    def import_csv(self, path):
+        self.write_tasks(read_csv(path)[0])
+
+
+class CSVStorage(FileStorage):
+    """tasks_<user>.csv, one task per row."""
+
+    extension = '.csv'
+
+    def __init__(self, username):
+        super().__init__(username)
+        # kept from before storage backends existed
+        self.journal_path = os.path.join(DATA_DIR, f"tasks_{username}.journal")
+
+    def read_tasks(self):
+        if not self.exists():
+            return [], False
+        return read_csv(self.path)
+
+    def _write_base(self, tasks):
+        write_csv(self.path, tasks)
+
+    def _scan(self, start, end, skip):
+        if not self.exists():
+            return
+        lo = start.isoformat() if start else None
+        hi = end.isoformat() if end else None
+        with open(self.path, 'r', newline='', encoding='utf-8') as f:
+            for row in csv.reader(f):
+                if not row or (len(row) > 5 and row[5] in skip):
+                    continue
+                # ISO dates compare correctly as strings
+                d = row[4]
+                if (lo is not None and d < lo) or (hi is not None and d > hi):
+                    continue
+                yield Task.from_csv_row(row)
+
+    def export_csv(self, path):
+        if self.exists():
+            shutil.copy2(self.path, path)
+        else:
+            write_csv(path, [])
+
+    def import_csv(self, path):
+        with self.locked():
+            with open(path, 'rb') as src, atomic_write(self.path, 'wb') as dst:
+                shutil.copyfileobj(src, dst)
+            self.clear_journal()
+
+
+class BinaryStorage(FileStorage):
+    """tasks_<user>.ffb: a JSON header with the string table, then fixed-width records.
+
+    The records are memory-mapped on load, so the numeric columns go straight
+    into TaskColumns without being parsed.
+    """
+
+    extension = '.ffb'
+    MAGIC = b'FFB1'
+    range_scan_is_cheap = True
+    # name/category/id are indexes into the header's string table
+    RECORD = [('ordinal', '<i4'), ('hours', '<f8'), ('completed', 'u1'),
+              ('category', '<i4'), ('name', '<i4'), ('id', '<i4')]
+
+    def __init__(self, username):
+        global np
+        if np is None:
+            try:
+                import numpy as np
+            except ImportError:
+                raise ImportError('the binary storage backend needs numpy') from None
+        super().__init__(username)
+        self._records = None
+        self._strings = None
+
+    def _load(self):
+        with open(self.path, 'rb') as f:
+            if f.read(4) != self.MAGIC:
+                raise ValueError(f'{self.path} is not a FocusFlow binary file')
+            header_len = int.from_bytes(f.read(8), 'little')
+            header = json.loads(f.read(header_len).decode('utf-8'))
+        count = header['count']
+        dtype = np.dtype(self.RECORD)
+        if count:
+            records = np.memmap(self.path, dtype=dtype, mode='r', offset=12 + header_len, shape=(count,))
+        else:
+            records = np.zeros(0, dtype=dtype)
+        return records, header['strings']
+
+    def read_tasks(self):
+        self._records = self._strings = None
+        if not self.exists():
+            return [], False
+        records, strings = self._load()
+        names = [strings[i] for i in records['name'].tolist()]
+        categories = [strings[i] for i in records['category'].tolist()]
+        ids = [strings[i] for i in records['id'].tolist()]
+        days = {}
+        tasks = []
+        new = object.__new__
+        for name, cat, hours, done, ordinal, tid in zip(
+                names, categories, records['hours'].tolist(),
+                records['completed'].tolist(), records['ordinal'].tolist(), ids):
+            t = new(Task)
+            t.name = name
+            t.category = cat
+            t.hours = hours
+            t.completed = bool(done)
+            d = days.get(ordinal)
+            if d is None:
+                d = days[ordinal] = date.fromordinal(ordinal)
+            t.date = d
+            t.id = tid
+            tasks.append(t)
+        self._records, self._strings = records, strings
+        return tasks, False
+
+    def build_columns(self, columns, tasks):
+        if self._records is None or len(self._records) != len(tasks):
+            return super().build_columns(columns, tasks)
+        codes, category_codes = np.unique(self._records['category'], return_inverse=True)
+        columns.build_arrays(
+            self._records['ordinal'], self._records['hours'], self._records['completed'].astype(bool),
+            category_codes, [self._strings[c] for c in codes.tolist()], [t.id for t in tasks],
+        )
+
+    def _write_base(self, tasks):
+        strings, lookup = [], {}
+
+        def code(s):
+            i = lookup.get(s)
+            if i is None:
+                i = lookup[s] = len(strings)
+                strings.append(s)
+            return i
+
+        records = np.zeros(len(tasks), dtype=np.dtype(self.RECORD))
+        records['ordinal'] = [t.date.toordinal() for t in tasks]
+        records['hours'] = [t.hours for t in tasks]
+        records['completed'] = [t.completed for t in tasks]
+        records['category'] = [code(t.category) for t in tasks]
+        records['name'] = [code(t.name) for t in tasks]
+        records['id'] = [code(t.id) for t in tasks]
+        header = json.dumps({'count': len(tasks), 'strings': strings}).encode('utf-8')
+        # pad so the records start 8-byte aligned
+        header += b' ' * (-(12 + len(header)) % 8)
+        # drop our own mapping before the file is replaced
+        self._records = None
+        with atomic_write(self.path, 'wb') as f:
+            f.write(self.MAGIC)
+            f.write(len(header).to_bytes(8, 'little'))
+            f.write(header)
+            f.write(records.tobytes())
+
+    def _scan(self, start, end, skip):
+        if not self.exists():
+            return
+        records, strings = self._load()
+        mask = np.ones(len(records), dtype=bool)
+        if start is not None:
+            mask &= records['ordinal'] >= start.toordinal()
+        if end is not None:
+            mask &= records['ordinal'] <= end.toordinal()
+        for r in records[mask].tolist():
+            ordinal, hours, done, cat, name, tid = r
+            if strings[tid] in skip:
+                continue
+            yield Task(strings[name], strings[cat], hours, done, date.fromordinal(ordinal), strings[tid])
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    username TEXT PRIMARY KEY,
+    password TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS tasks (
+    id TEXT PRIMARY KEY,
+    username TEXT NOT NULL,
+    name TEXT NOT NULL,
+    category TEXT NOT NULL,
+    hours REAL NOT NULL,
+    completed INTEGER NOT NULL,
+    date TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_user_date ON tasks (username, date);
+CREATE INDEX IF NOT EXISTS idx_tasks_user_category ON tasks (username, category);
+"""
+
+_connections = {}
+
+def sqlite_connect(path=None):
+    """Shared connection to the SQLite database (created on first use)."""
+    path = path or DB_FILE
+    conn = _connections.get(path)
+    if conn is None:
+        ensure_data_dir()
+        conn = sqlite3.connect(path, check_same_thread=False)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.executescript(_SCHEMA)
+        _connections[path] = conn
+    return conn
+
+def sqlite_save_users(users, path=None):
+    conn = sqlite_connect(path)
+    with conn:
+        conn.executemany(
+            'INSERT INTO users (username, password) VALUES (?, ?) '
+            'ON CONFLICT(username) DO UPDATE SET password = excluded.password',
+            [(u, info['password']) for u, info in users.items()],
+        )
+
+
+class SQLiteStorage:
+    """Tasks of one user in the shared SQLite database.
+
+    Every journal record is applied as a single-row statement, so there is
+    nothing to replay or compact. Ranged analytics run as SQL aggregates on
+    the (username, date) index.
+    """
+
+    _COLUMNS = 'name, category, hours, completed, date, id'
+    range_scan_is_cheap = True
+
+    def __init__(self, username, path=None):
+        self.username = username
+        self.path = path or DB_FILE
+        self.conn = sqlite_connect(self.path)
+        self.journal_len = 0
+        self._data_version = None
+        self.stale = False
+
+    def locked(self):
+        # SQLite serializes single statements, but User needs "check for changes, reload,
+        # mutate, write" to be atomic, so writers also take the same file lock as the file backends
+        return file_lock(self.path)
+
+    def _version(self):
+        # bumped whenever another connection commits to the database
+        return self.conn.execute('PRAGMA data_version').fetchone()[0]
+
+    def mark_synced(self):
+        self._data_version = self._version()
+        self.stale = False
+
+    def changed_on_disk(self):
+        return self._version() != self._data_version
+
+    @staticmethod
+    def _task(row):
+        name, category, hours, completed, d, tid = row
+        return Task(name, category, hours, completed, d, tid)
+
+    @staticmethod
+    def _params(t):
+        return (t.name, t.category, t.hours, int(t.completed), t.date.isoformat(), t.id)
+
+    def exists(self):
+        return self.conn.execute('SELECT 1 FROM tasks WHERE username = ? LIMIT 1', (self.username,)).fetchone() is not None
+
+    def read_tasks(self):
+        rows = self.conn.execute(
+            f'SELECT {self._COLUMNS} FROM tasks WHERE username = ? ORDER BY rowid', (self.username,))
+        return [self._task(r) for r in rows], False
+
+    def build_columns(self, columns, tasks):
+        columns.build(tasks)
+
+    def write_tasks(self, tasks):
+        with self.locked(), self.conn:
+            self.conn.execute('DELETE FROM tasks WHERE username = ?', (self.username,))
+            self.conn.executemany(
+                f'INSERT INTO tasks (username, {self._COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?)',
+                [(self.username,) + self._params(t) for t in tasks],
+            )
+
+    def append(self, record):
+        self.append_many([record])
+
+    def append_many(self, records):
+        # one transaction for the whole batch
+        with self.locked(), self.conn:
+            if self.changed_on_disk():
+                self.stale = True
+            for record in records:
+                op = record[0]
+                if op in ('A', 'U'):
+                    t = Task.from_csv_row(record[1:])
+                    self.conn.execute(
+                        f'INSERT OR REPLACE INTO tasks (username, {self._COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?)',
+                        (self.username,) + self._params(t),
+                    )
+                elif op == 'D':
+                    self.conn.execute('DELETE FROM tasks WHERE username = ? AND id = ?', (self.username, record[1]))
+
+    def read_journal(self):
+        return iter(())
+
+    def clear_journal(self):
+        pass
+
+    def iter_tasks(self, start=None, end=None):
+        sql = f'SELECT {self._COLUMNS} FROM tasks WHERE username = ?'
+        params = [self.username]
+        if start is not None:
+            sql += ' AND date >= ?'
+            params.append(start.isoformat())
+        if end is not None:
+            sql += ' AND date <= ?'
+            params.append(end.isoformat())
+        for row in self.conn.execute(sql, params):
+            yield self._task(row)
+
+    def analytics(self, start=None, end=None):
+        sql = ('SELECT category, COUNT(*), SUM(hours), SUM(completed), SUM(CASE WHEN completed THEN hours ELSE 0 END) '
+               'FROM tasks WHERE username = ?')
+        params = [self.username]
+        if start is not None and end is not None:
+            sql += ' AND date BETWEEN ? AND ?'
+            params += [start.isoformat(), end.isoformat()]
+        a = Analytics()
+        for category, count, hours, done, done_hours in self.conn.execute(sql + ' GROUP BY category', params):
+            a.task_count += count
+            a.total_hours += hours
+            a.completed_count += done
+            a.completed_hours += done_hours
+            a.category_sums[category] = hours
+            a.category_counts[category] = count
+        return a
+
+    def export_csv(self, path):
+        write_csv(path, self.read_tasks()[0])
+
+    def import_csv(self, path):
+        self.write_tasks(read_csv(path)[0])
+
+
+BACKENDS = {
+    'csv': CSVStorage,
+    'binary': BinaryStorage,
+    'sqlite': SQLiteStorage,
+}
+
+def open_storage(username, backend=None):
+    """Storage for username; backend is a BACKENDS key, a storage instance, or None for the configured default."""
+    if backend is None:
+        backend = STORAGE_BACKEND
+    if isinstance(backend, str):
+        if backend not in BACKENDS:
+            raise ValueError(f'Unknown storage backend: {backend}')
+        return BACKENDS[backend](username)
+    return backend
@@ -1,18 +1,56 @@
-from datetime import datetime
+import sys
+import uuid
+from datetime import date, datetime
+from functools import lru_cache
+
+def new_task_id():
+    return uuid.uuid4().hex
+
+@lru_cache(maxsize=8192)
+def parse_date(date_str):
+    # histories repeat the same days a lot, so tasks on one day share a date object
+    try:
+        return date.fromisoformat(date_str)
+    except ValueError:
+        # fromisoformat wants zero padding; strptime, used to validate input, takes 2024-1-5
+        return datetime.strptime(date_str, '%Y-%m-%d').date()
 
 class Task:
-    def __init__(self, name, category, hours, completed, date_str):
+    __slots__ = ('name', 'category', 'hours', 'completed', 'date', 'id')
+
+    def __init__(self, name, category, hours, completed, date_str, task_id=None):
         self.name = name
-        self.category = category
+        self.category = sys.intern(category)
         self.hours = float(hours)
         self.completed = bool(completed)
-        # expects date_str in YYYY-MM-DD
-        self.date = datetime.strptime(date_str, "%Y-%m-%d").date()
+        # expects date_str in YYYY-MM-DD (a date object is taken as is)
+        self.date = date_str if isinstance(date_str, date) else parse_date(date_str)
+        # stable identity, persisted as the last CSV column
+        self.id = task_id or new_task_id()
 
     def to_csv_row(self):
-        return [self.name, self.category, str(self.hours), str(int(self.completed)), self.date.isoformat()]
+        return [self.name, self.category, str(self.hours), str(int(self.completed)), self.date.isoformat(), self.id]
 
     @staticmethod
     def from_csv_row(row):
-        # row: [name, category, hours, completed(0/1), date]
-        return Task(row[0], row[1], float(row[2]), bool(int(row[3])), row[4])
+        # row: [name, category, hours, completed(0/1), date, id]; older files have no id column
+        task_id = row[5] if len(row) > 5 else None
+        return Task(row[0], row[1], row[2], row[3] == '1', row[4], task_id)
+
+    @staticmethod
+    def from_csv_rows(rows):
+        """from_csv_row for a whole file: fills the slots directly instead of going through __init__."""
+        new = object.__new__
+        intern = sys.intern
+        out = []
+        append = out.append
+        for row in rows:
+            t = new(Task)
+            t.name = row[0]
+            t.category = intern(row[1])
+            t.hours = float(row[2])
+            t.completed = row[3] == '1'
+            t.date = parse_date(row[4])
+            t.id = (row[5] if len(row) > 5 else None) or new_task_id()
+            append(t)
+        return out
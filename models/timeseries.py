@@ -0,0 +1,68 @@
+from datetime import date
+import numpy as np
+
+# date.toordinal() of 1970-01-01, the datetime64 epoch
+_EPOCH = 719163
+# most points a chart gets; longer series are bucketed, then downsampled
+MAX_POINTS = 180
+FREQS = ('day', 'week', 'month')
+_FREQ_DAYS = {'day': 1, 'week': 7, 'month': 30}
+
+def to_datetime64(ordinals):
+    return (np.asarray(ordinals, dtype=np.int64) - _EPOCH).astype('datetime64[D]')
+
+def pick_freq(span_days, max_points=MAX_POINTS):
+    """The finest bucket that keeps span_days under max_points points."""
+    for freq in FREQS:
+        if span_days / _FREQ_DAYS[freq] <= max_points:
+            return freq
+    return 'month'
+
+def resample(ordinals, values, freq):
+    """Sum values into day/week/month buckets; returns (bucket start ordinals, sums)."""
+    o = np.asarray(ordinals, dtype=np.int64)
+    if freq == 'day':
+        keys = o
+    elif freq == 'week':
+        keys = o - (o - 1) % 7  # ordinal 1 (0001-01-01) is a Monday
+    elif freq == 'month':
+        keys = to_datetime64(o).astype('datetime64[M]').astype('datetime64[D]').astype(np.int64) + _EPOCH
+    else:
+        raise ValueError(f'Unknown frequency: {freq}')
+    starts, inverse = np.unique(keys, return_inverse=True)
+    return starts, np.bincount(inverse, weights=np.asarray(values, dtype=np.float64), minlength=starts.size)
+
+def minmax_downsample(x, y, n_out):
+    """Keep the lowest and highest point of each of n_out // 2 equal-count buckets.
+
+    Peaks and dips survive, unlike plain striding; x must be sorted.
+    """
+    n = len(x)
+    if n <= n_out:
+        return x, y
+    nb = max(n_out // 2, 1)
+    bucket = np.arange(n) * nb // n
+    order = np.lexsort((y, bucket))  # by bucket, then by value within it
+    starts = np.searchsorted(bucket, np.arange(nb))
+    ends = np.append(starts[1:], n) - 1
+    keep = np.unique(np.concatenate((order[starts], order[ends])))
+    return x[keep], y[keep]
+
+def completed_hours_series(days, hours, window_days=None, freq='auto', max_points=MAX_POINTS, today=None):
+    """Plot-ready (datetime64 bucket starts, hours, freq) from per-day dates and hours.
+
+    window_days keeps only the last window_days days up to today; freq='auto'
+    picks day/week/month from the span so the point count stays bounded.
+    """
+    ordinals = np.fromiter((d.toordinal() for d in days), dtype=np.int64, count=len(days))
+    values = np.asarray(hours, dtype=np.float64)
+    if window_days:
+        end = (today or date.today()).toordinal()
+        mask = (ordinals > end - window_days) & (ordinals <= end)
+        ordinals, values = ordinals[mask], values[mask]
+    if freq == 'auto':
+        span = int(ordinals[-1] - ordinals[0]) + 1 if ordinals.size else 0
+        freq = pick_freq(span, max_points)
+    starts, sums = resample(ordinals, values, freq)
+    starts, sums = minmax_downsample(starts, sums, max_points)
+    return to_datetime64(starts), sums, freq
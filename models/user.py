@@ -1,113 +1,650 @@
 import os
-import csv
-import shutil
-from datetime import datetime
-from .task import Task
+import gc
+import sys
+from contextlib import contextmanager, nullcontext
+from bisect import bisect_left, bisect_right, insort
+from datetime import date, datetime
+from .task import Task, parse_date
+from .analytics import Analytics
+from .storage import open_storage, write_csv
 from utils.paths import DATA_DIR
 
+def _task_columns():
+    # imported on first use: numpy takes longer to import than the rest of the app
+    try:
+        from .columns import TaskColumns
+    except ImportError:  # numpy is optional for the model layer
+        return None
+    return TaskColumns
+
+# number of journal records after which the journal is folded into the base file
+JOURNAL_COMPACT_THRESHOLD = 500
+# bulk changes rebuild the indexes instead of patching them once they touch at least this many
+# tasks and at least 1/BULK_REINDEX_SHARE of the history; a few hundred out of a million patch faster
+BULK_REINDEX_MIN = 32
+BULK_REINDEX_SHARE = 4
+
+@contextmanager
+def _gc_paused():
+    # building hundreds of thousands of objects otherwise triggers a collection every few hundred
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+class _Batch:
+    __slots__ = ('records', 'rewrite', 'undo')
+
+    def __init__(self):
+        self.records = []
+        # set once the batch is big enough to rewrite the base file instead of journalling
+        self.rewrite = False
+        # what to put back on rollback, newest last: ('insert', task), ('remove', task, position),
+        # ('fields', task, old field values) or ('tasks', old task list)
+        self.undo = []
+
 class User:
-    def __init__(self, username):
+    def __init__(self, username, columnar=None, load=True, storage=None):
+        """columnar: mirror tasks into NumPy arrays (default: whenever numpy is available).
+        load: read the whole history now; with load=False only iter_tasks() touches the disk
+        until load_tasks() is called.
+        storage: a models.storage backend name or instance (default: utils.paths.STORAGE_BACKEND).
+
+        Set .writer to a models.persistence.PersistenceWorker to make writes
+        write-behind; call flush() before anything else reads the files.
+        """
         self.username = username
-        self.tasks_file = os.path.join(DATA_DIR, f"tasks_{username}.csv")
+        self.storage = open_storage(username, storage)
+        self.tasks_file = self.storage.path
         self.tasks = []
-        self.load_tasks()
+        TaskColumns = _task_columns() if columnar is not False else None
+        if columnar is None:
+            columnar = TaskColumns is not None
+        self.columns = TaskColumns() if columnar else None
+        self.loaded = False
+        self.writer = None
+        self._batch = None
+        self._write_depth = 0  # nesting of _writing() blocks
+        # set when the last load skipped unreadable journal records: the journal is then kept as is
+        self._journal_damaged = False
+        # bumped on every change, so views can tell whether what they show is stale
+        self.data_version = 0
+        self._listeners = []
+        self._reset_indexes()
+        if load:
+            self.load_tasks()
 
     # ---------- persistence ----------
     def load_tasks(self):
+        """Read the whole history. If the base file cannot be read the error is raised and the
+        User stays unloaded, so the partial history in memory is never written back over it."""
         self.tasks = []
-        if not os.path.exists(self.tasks_file):
-            return
-        try:
-            with open(self.tasks_file, 'r', newline='', encoding='utf-8') as f:
-                reader = csv.reader(f)
-                for row in reader:
-                    if row:
-                        self.tasks.append(Task.from_csv_row(row))
-        except Exception as e:
-            print('Error loading tasks:', e)
+        self.loaded = False
+        # locked so no other process writes between reading the base file and the journal
+        with self.storage.locked(), _gc_paused():
+            self.tasks, missing_ids = self.storage.read_tasks()
+            self._build_indexes()
+            if self.columns is not None:
+                self.storage.build_columns(self.columns, self.tasks)
+            self._journal_damaged = self._replay_journal() > 0
+            self.storage.mark_synced()
+            self.loaded = True
+            self._notify('reload')
+            if self._journal_damaged:
+                print('Journal has unreadable records; not compacting it:', self.storage.journal_path)
+            elif missing_ids or self.storage.journal_len >= JOURNAL_COMPACT_THRESHOLD:
+                # also persists the ids generated for a file written before task ids existed
+                self.compact()
+
+    @contextmanager
+    def _writing(self):
+        """Hold the storage lock for one mutation, first reloading if another process changed the data.
+
+        With a writer set, locking and touching the files is left to the writer
+        thread, so this side stays in memory and never waits on the disk.
+        """
+        with nullcontext() if self.writer is not None else self.storage.locked():
+            # only the outermost block may reload: a nested one (compact() during a mutation,
+            # anything inside batch()) runs with changes in memory that are not written yet.
+            # Likewise with writes still queued the files lag behind memory.
+            if (self._write_depth == 0 and self.loaded and not self.writes_pending()
+                    and self._changed_elsewhere()):
+                self.load_tasks()
+            self._write_depth += 1
+            try:
+                yield
+            finally:
+                self._write_depth -= 1
+
+    def _changed_elsewhere(self):
+        if self.writer is not None:
+            # checking the files here would wait for the writer thread's lock; it flags
+            # another process's writes as it goes instead
+            return self.storage.stale
+        return self.storage.changed_on_disk()
+
+    def writes_pending(self):
+        return self.writer is not None and self.writer.pending()
+
+    def flush(self):
+        """Wait for queued writes to reach the disk."""
+        if self.writer is not None:
+            self.writer.flush()
+
+    def _replay_journal(self):
+        """Apply the journal to memory; returns how many records could not be read."""
+        removed = False
+        bad = 0
+        for n, rec in enumerate(self.storage.read_journal(), 1):
+            op = rec[0]
+            try:
+                if op in ('A', 'U'):
+                    t = Task.from_csv_row(rec[1:])
+                    old = self._by_id.get(t.id)
+                    if old is not None:
+                        self._replace(old, t)
+                    else:
+                        self._insert(t)
+                elif op == 'D':
+                    old = self._by_id.get(rec[1])
+                    if old is not None:
+                        # only unindexed here; list.remove() per record would make replay quadratic
+                        self._unindex(old)
+                        removed = True
+                else:
+                    raise ValueError(f'unknown operation {op!r}')
+            except (ValueError, IndexError) as e:
+                # a record torn by a crash mid-append only loses that record
+                print(f'Skipping journal record {n}:', e)
+                bad += 1
+        if removed:
+            by_id = self._by_id
+            self.tasks = [t for t in self.tasks if by_id.get(t.id) is t]
+        return bad
+
+    def iter_tasks(self, start=None, end=None):
+        """Stream tasks dated start..end (inclusive) straight from disk.
+
+        Tasks outside the range are skipped without building a Task, so this is
+        cheap even when the history has not been loaded (User(..., load=False)).
+        Journalled changes are applied on the fly and come last.
+        """
+        return self.storage.iter_tasks(
+            self._as_date(start) if start else None,
+            self._as_date(end) if end else None,
+        )
+
+    def _append_journal(self, record):
+        if self._batch is not None:
+            self._batch.records.append(record)
+        else:
+            self._append_records([record])
+
+    def _append_records(self, records):
+        if self.writer is not None:
+            for record in records:
+                self.writer.append(self.storage, record)
+        else:
+            self.storage.append_many(records)
+        if self.loaded and not self._journal_damaged and self.storage.journal_len >= JOURNAL_COMPACT_THRESHOLD:
+            self.compact()
+
+    def _check_loaded(self):
+        if not self.loaded:
+            raise RuntimeError('Tasks are not loaded; refusing to overwrite the stored history')
 
     def save_all_tasks(self):
-        with open(self.tasks_file, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            for t in self.tasks:
-                writer.writerow(t.to_csv_row())
+        self._check_loaded()
+        self.storage.write_tasks(self.tasks)
 
-    def add_task(self, task: Task):
+    def compact(self):
+        """Fold the journal into the base file."""
+        if self.writer is not None:
+            self._rewrite_base()
+            return
+        with self._writing():
+            self._rewrite_base()
+
+    def _rewrite_base(self):
+        # callers are inside _writing(), or hand the write to the writer thread
+        if self.writer is None:
+            self.save_all_tasks()
+            return
+        self._check_loaded()
+        # queued behind the records already journalled; repeated requests collapse into one
+        tasks = list(self.tasks)
+        self.writer.submit(('compact', self.storage.path), lambda: self._write_snapshot(tasks))
+
+    def _write_snapshot(self, tasks):
+        # writer thread: tasks is a copy of memory, which misses anything another process wrote
+        # since the last load. Then the journal is kept instead and the next mutation reloads.
+        with self.storage.locked():
+            if self.storage.stale or self.storage.changed_on_disk():
+                self.storage.stale = True
+                return
+            self.storage.write_tasks(tasks)
+
+    @contextmanager
+    def batch(self):
+        """Group changes so they are persisted and announced once.
+
+        Inside the block changes apply to memory as usual, but their journal
+        records are held back and written together on exit (or as one rewrite
+        of the base file when there are many), and listeners get a single
+        'reload'. If the block raises, memory is rolled back and nothing is
+        written. Nested batches join the outer one.
+        """
+        if self._batch is not None:
+            yield self
+            return
+        with self._writing():
+            b = self._batch = _Batch()
+            try:
+                yield self
+            except BaseException:
+                self._batch = None
+                self._roll_back(b.undo)
+                raise
+            self._batch = None
+            # written while this block still holds the lock, so nothing can reload in between
+            if self.writer is not None:
+                # the records go first: the rewrite from a snapshot is skipped if another process wrote
+                self._append_records(b.records)
+                if b.rewrite or len(b.records) >= JOURNAL_COMPACT_THRESHOLD:
+                    self._rewrite_base()
+            elif b.rewrite or len(b.records) >= JOURNAL_COMPACT_THRESHOLD:
+                self._rewrite_base()
+            elif b.records:
+                self._append_records(b.records)
+        if b.rewrite or b.records:
+            self._notify('reload')
+
+    def _undo(self, *entry):
+        if self._batch is not None:
+            self._batch.undo.append(entry)
+
+    def _roll_back(self, undo):
+        # undone newest first, so each entry sees the list as it was right after that change;
+        # the indexes are rebuilt once at the end instead of being patched along the way
+        for entry in reversed(undo):
+            kind, obj = entry[0], entry[1]
+            if kind == 'insert':
+                self.tasks.pop()
+            elif kind == 'remove':
+                self.tasks.insert(entry[2], obj)
+            elif kind == 'fields':
+                obj.name, obj.category, obj.hours, obj.completed, obj.date = entry[2]
+            else:
+                self.tasks = obj
+        if undo:
+            self._rebuild_indexes()
+
+    # ---------- change notification ----------
+    def subscribe(self, callback):
+        """Call callback(event, task) after every change.
+
+        event is 'add', 'update' or 'delete' with the task concerned, or
+        'reload' with None when the whole history was re-read.
+        """
+        self._listeners.append(callback)
+
+    def unsubscribe(self, callback):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _notify(self, event, task=None):
+        if self._batch is not None:
+            return  # announced as one 'reload' when the batch commits
+        self.data_version += 1
+        for callback in list(self._listeners):
+            callback(event, task)
+
+    # ---------- in-memory indexes ----------
+    def _reset_indexes(self):
+        self._by_id = {}
+        # date -> tasks on that day, plus the sorted distinct dates for range lookups
+        self._by_date = {}
+        self._dates = []
+        # running totals over the whole history
+        self._hours = 0.0
+        self._completed_hours = 0.0
+        self._completed_count = 0
+        self._cat_sums = {}
+        self._cat_counts = {}
+
+    def _build_indexes(self):
+        """Index all of self.tasks at once; same result as _index on each task, minus the per-call overhead."""
+        self._reset_indexes()
+        by_date = self._by_date
+        sums, counts = self._cat_sums, self._cat_counts
+        hours = completed_hours = 0.0
+        completed_count = 0
+        for t in self.tasks:
+            bucket = by_date.get(t.date)
+            if bucket is None:
+                by_date[t.date] = [t]
+            else:
+                bucket.append(t)
+            h = t.hours
+            hours += h
+            if t.completed:
+                completed_hours += h
+                completed_count += 1
+            c = t.category
+            sums[c] = sums.get(c, 0.0) + h
+            counts[c] = counts.get(c, 0) + 1
+        self._by_id = {t.id: t for t in self.tasks}
+        self._dates = sorted(by_date)
+        self._hours = hours
+        self._completed_hours = completed_hours
+        self._completed_count = completed_count
+
+    def _worth_rebuilding(self, count):
+        return count >= BULK_REINDEX_MIN and count * BULK_REINDEX_SHARE >= len(self.tasks)
+
+    def _rebuild_indexes(self):
+        self._build_indexes()
+        if self.columns is not None:
+            self.columns.build(self.tasks)
+
+    def _index(self, task, by_date=True):
+        self._by_id[task.id] = task
+        self._hours += task.hours
+        if task.completed:
+            self._completed_hours += task.hours
+            self._completed_count += 1
+        self._cat_sums[task.category] = self._cat_sums.get(task.category, 0.0) + task.hours
+        self._cat_counts[task.category] = self._cat_counts.get(task.category, 0) + 1
+        if self.columns is not None:
+            self.columns.add(task)
+        if not by_date:
+            return
+        bucket = self._by_date.get(task.date)
+        if bucket is None:
+            self._by_date[task.date] = [task]
+            insort(self._dates, task.date)
+        else:
+            bucket.append(task)
+
+    def _unindex(self, task, by_date=True):
+        """by_date=False leaves the task in its day's bucket, for an update that keeps the date."""
+        del self._by_id[task.id]
+        self._hours -= task.hours
+        if task.completed:
+            self._completed_hours -= task.hours
+            self._completed_count -= 1
+        if self._cat_counts[task.category] == 1:
+            del self._cat_sums[task.category]
+            del self._cat_counts[task.category]
+        else:
+            self._cat_sums[task.category] -= task.hours
+            self._cat_counts[task.category] -= 1
+        if self.columns is not None:
+            self.columns.remove(task)
+        if not self._by_id:
+            # drop accumulated float error once the history is empty
+            self._hours = self._completed_hours = 0.0
+        if not by_date:
+            return
+        bucket = self._by_date[task.date]
+        bucket.remove(task)
+        if not bucket:
+            del self._by_date[task.date]
+            del self._dates[bisect_left(self._dates, task.date)]
+
+    @staticmethod
+    def _fields(t):
+        return t.name, t.category, t.hours, t.completed, t.date
+
+    def _insert(self, task):
+        self._undo('insert', task)
         self.tasks.append(task)
-        self.save_all_tasks()
+        self._index(task)
+
+    def _remove(self, task):
+        i = self.tasks.index(task)
+        self._undo('remove', task, i)
+        del self.tasks[i]
+        self._unindex(task)
+
+    def _replace(self, old, new):
+        # copied into the task already in self.tasks, so its position need not be searched for
+        self._undo('fields', old, self._fields(old))
+        moved = old.date != new.date
+        self._unindex(old, moved)
+        old.name, old.category, old.hours, old.completed, old.date = new.name, new.category, new.hours, new.completed, new.date
+        self._index(old, moved)
+
+    # ---------- tasks ----------
+    def get_task(self, task_id):
+        return self._by_id.get(task_id)
+
+    def add_task(self, task: Task):
+        with self._writing():
+            self._insert(task)
+            self._append_journal(['A'] + task.to_csv_row())
+        self._notify('add', task)
+
+    def add_tasks(self, tasks):
+        """Add many tasks as one batch (see batch()).
+
+        A task whose id is already present replaces the stored one. Returns
+        the number of tasks given.
+        """
+        incoming = {t.id: t for t in tasks}
+        if not incoming:
+            return 0
+        with self.batch():
+            if not self._worth_rebuilding(len(incoming)):
+                for t in incoming.values():
+                    old = self._by_id.get(t.id)
+                    if old is not None:
+                        self._replace(old, t)
+                    else:
+                        self._insert(t)
+            else:
+                with _gc_paused():
+                    self._undo('tasks', self.tasks)
+                    replaced = {t.id for t in self.tasks if t.id in incoming}
+                    # a new list, so the old one stays intact for a rollback
+                    self.tasks = [incoming[t.id] if t.id in replaced else t for t in self.tasks]
+                    self.tasks.extend(t for tid, t in incoming.items() if tid not in replaced)
+                    # re-indexing everything once beats indexing each new task separately
+                    self._rebuild_indexes()
+            self._journal_many(['A'] + t.to_csv_row() for t in incoming.values())
+        return len(incoming)
+
+    def delete_tasks(self, ids):
+        """Delete the tasks with the given ids as one batch; returns how many existed."""
+        doomed = {tid for tid in ids if tid in self._by_id}
+        if not doomed:
+            return 0
+        with self.batch():
+            if len(doomed) < BULK_REINDEX_MIN:
+                for tid in doomed:
+                    self._remove(self._by_id[tid])
+            else:
+                # one pass over the list instead of a search per task
+                gone = [self._by_id[tid] for tid in doomed]
+                self._undo('tasks', self.tasks)
+                self.tasks = [t for t in self.tasks if t.id not in doomed]
+                if self._worth_rebuilding(len(doomed)):
+                    self._rebuild_indexes()
+                else:
+                    for t in gone:
+                        self._unindex(t)
+            self._journal_many(['D', tid] for tid in doomed)
+        return len(doomed)
+
+    def update_where(self, predicate, **fields):
+        """Set fields on every task for which predicate(task) is true, as one batch.
+
+        Takes the same fields as update_task_by_id; returns the number of tasks changed.
+        """
+        values = self._convert(fields)
+        with self.batch():
+            hits = [t for t in self.tasks if predicate(t)]
+            if not self._worth_rebuilding(len(hits)):
+                for t in hits:
+                    self._update(t, values)
+            else:
+                for t in hits:
+                    self._undo('fields', t, self._fields(t))
+                    for field, value in values.items():
+                        setattr(t, field, value)
+                self._rebuild_indexes()
+                self._journal_many(['U'] + t.to_csv_row() for t in hits)
+        return len(hits)
+
+    def _journal_many(self, records):
+        # a bulk change big enough to trigger compaction anyway skips the journal records,
+        # unless a writer thread may have to fall back to them
+        b = self._batch
+        if not b.rewrite:
+            b.records.extend(records)
+            if len(b.records) >= JOURNAL_COMPACT_THRESHOLD and self.writer is None:
+                b.rewrite = True
+                b.records = []
+
+    def delete_task_by_id(self, task_id):
+        with self._writing():
+            t = self._by_id.get(task_id)
+            if t is None:
+                return False
+            self._remove(t)
+            self._append_journal(['D', task_id])
+        self._notify('delete', t)
+        return True
+
+    def update_task_by_id(self, task_id, **kwargs):
+        with self._writing():
+            t = self._by_id.get(task_id)
+            if t is None:
+                return False
+            self._update(t, self._convert(kwargs))
+        self._notify('update', t)
+        return True
+
+    def _convert(self, fields):
+        # done before touching any task, so a bad value leaves the tasks and the indexes as they were
+        convert = {'name': str, 'category': sys.intern, 'hours': float, 'completed': bool, 'date': self._as_date}
+        return {field: convert[field](value) for field, value in fields.items() if field in convert}
+
+    def _update(self, t, values):
+        self._undo('fields', t, self._fields(t))
+        moved = values.get('date', t.date) != t.date
+        self._unindex(t, moved)
+        for field, value in values.items():
+            setattr(t, field, value)
+        self._index(t, moved)
+        self._append_journal(['U'] + t.to_csv_row())
 
     def delete_task(self, index):
         if 0 <= index < len(self.tasks):
-            del self.tasks[index]
-            self.save_all_tasks()
-            return True
+            return self.delete_task_by_id(self.tasks[index].id)
         return False
 
     def update_task(self, index, **kwargs):
         if 0 <= index < len(self.tasks):
-            t = self.tasks[index]
-            t.name = kwargs.get('name', t.name)
-            t.category = kwargs.get('category', t.category)
-            t.hours = float(kwargs.get('hours', t.hours))
-            t.completed = bool(kwargs.get('completed', t.completed))
-            if 'date' in kwargs:
-                t.date = datetime.strptime(kwargs['date'], '%Y-%m-%d').date()
-            self.save_all_tasks()
-            return True
+            return self.update_task_by_id(self.tasks[index].id, **kwargs)
         return False
 
     # ---------- analytics ----------
     def tasks_on_date(self, d):
-        return [t for t in self.tasks if t.date == d]
+        return list(self._by_date.get(d, ()))
+
+    @staticmethod
+    def _as_date(d):
+        return d if isinstance(d, date) else parse_date(d)
 
     def tasks_in_range(self, start, end):
-        s = datetime.strptime(start, '%Y-%m-%d').date()
-        e = datetime.strptime(end, '%Y-%m-%d').date()
-        return [t for t in self.tasks if s <= t.date <= e]
+        # tasks are returned grouped by date, oldest first
+        s = self._as_date(start)
+        e = self._as_date(end)
+        lo = bisect_left(self._dates, s)
+        hi = bisect_right(self._dates, e)
+        out = []
+        for d in self._dates[lo:hi]:
+            out.extend(self._by_date[d])
+        return out
+
+    def analytics(self, start=None, end=None):
+        """All metrics for start..end (inclusive) in one pass; whole history if either is missing.
+
+        Backends that can aggregate themselves (SQLite) answer ranged queries, and
+        whole-history ones too while the tasks are not loaded.
+        """
+        pushdown = getattr(self.storage, 'analytics', None)
+        if pushdown is not None and self.loaded and self.writes_pending():
+            # the database has not caught up with memory yet
+            pushdown = None
+        if not (start and end):
+            if pushdown is not None and not self.loaded:
+                return pushdown()
+            return Analytics(
+                self._hours, self._completed_hours, len(self.tasks), self._completed_count,
+                dict(self._cat_sums), dict(self._cat_counts),
+            )
+        if pushdown is not None:
+            return pushdown(self._as_date(start), self._as_date(end))
+        if self.columns is not None:
+            return self.columns.analytics(self._as_date(start), self._as_date(end))
+        return Analytics.from_tasks(self.tasks_in_range(start, end))
 
     def total_productive_hours(self, start=None, end=None):
-        tasks = self.tasks_in_range(start, end) if (start and end) else self.tasks
-        return sum(t.hours for t in tasks if t.completed)
+        return self.analytics(start, end).completed_hours
 
     def total_hours(self, start=None, end=None):
-        tasks = self.tasks_in_range(start, end) if (start and end) else self.tasks
-        return sum(t.hours for t in tasks)
+        return self.analytics(start, end).total_hours
 
     def completion_rate(self, start=None, end=None):
-        tasks = self.tasks_in_range(start, end) if (start and end) else self.tasks
-        if not tasks:
-            return 0.0
-        completed = sum(1 for t in tasks if t.completed)
-        return (completed / len(tasks)) * 100
+        return self.analytics(start, end).completion_rate
 
     def average_time_per_category(self, start=None, end=None):
-        tasks = self.tasks_in_range(start, end) if (start and end) else self.tasks
-        sums = {}
-        counts = {}
-        for t in tasks:
-            sums[t.category] = sums.get(t.category, 0.0) + t.hours
-            counts[t.category] = counts.get(t.category, 0) + 1
-        return {k: (sums[k] / counts[k]) for k in sums}
+        return self.analytics(start, end).average_time_per_category
 
     def productivity_score(self, start=None, end=None):
-        completed_hours = self.total_productive_hours(start, end)
-        total = self.total_hours(start, end)
-        if total == 0:
-            return 0.0
-        return (completed_hours / total) * 100
+        return self.analytics(start, end).productivity_score
+
+    # ---------- chart series ----------
+    def hours_by_category(self):
+        return dict(self._cat_sums)
+
+    def daily_completed_hours(self):
+        """(dates, hours) of completed work per day, oldest first."""
+        if self.columns is not None:
+            days, hours = self.columns.daily_series()
+            return [date.fromordinal(int(d)) for d in days], hours.tolist()
+        dates, hours = [], []
+        for d in self._dates:
+            done = [t.hours for t in self._by_date[d] if t.completed]
+            if done:
+                dates.append(d)
+                hours.append(sum(done))
+        return dates, hours
 
     # ---------- backup / restore ----------
     def backup(self):
-        if not os.path.exists(self.tasks_file):
-            return None
-        ts = datetime.now().strftime('%Y%m%d_%H%M%S')
-        dest = os.path.join(DATA_DIR, f'backup_{self.username}_{ts}.csv')
-        shutil.copy2(self.tasks_file, dest)
-        return dest
+        self.flush()
+        # exported from the files rather than memory, which may be behind another process
+        with self.storage.locked():
+            if not self.storage.exists() and not self.storage.journal_len:
+                return None
+            ts = datetime.now().strftime('%Y%m%d_%H%M%S')
+            dest = os.path.join(DATA_DIR, f'backup_{self.username}_{ts}.csv')
+            if self.storage.journal_len:
+                write_csv(dest, self.storage.iter_tasks())
+            else:
+                self.storage.export_csv(dest)
+            return dest
 
     def restore(self, path):
         if not os.path.exists(path):
             raise FileNotFoundError('Backup not found')
-        shutil.copy2(path, self.tasks_file)
-        self.load_tasks()
-
+        self.flush()
+        with self.storage.locked():
+            self.storage.import_csv(path)
+            self.load_tasks()
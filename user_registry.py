@@ -0,0 +1,144 @@
+import os
+import json
+from utils.paths import USERS_FILE, STORAGE_BACKEND
+from models.storage import sqlite_connect
+from utils.fileio import atomic_write, file_lock, file_signature
+
+# registrations appended to the log before it is folded into users.json
+LOG_COMPACT_THRESHOLD = 1000
+
+class UserRegistry:
+    """Accounts from users.json, cached in memory.
+
+    New accounts are appended to users.json.log (one JSON object per line)
+    instead of rewriting users.json; the log is folded back in once it grows
+    past LOG_COMPACT_THRESHOLD. The cache is only re-read when one of the two
+    files changed on disk, so lookups are dict lookups. Writers hold an advisory
+    lock on users.json, so several processes can register at once.
+    """
+
+    def __init__(self, users_file=USERS_FILE):
+        self.users_file = users_file
+        self.log_file = users_file + '.log'
+        self._users = {}
+        self._log_len = 0
+        self._signature = None
+
+    def _stat(self):
+        return file_signature(self.users_file, self.log_file)
+
+    def _refresh(self):
+        sig = self._stat()
+        if sig == self._signature:
+            return
+        try:
+            with open(self.users_file, 'r', encoding='utf-8') as f:
+                users = json.load(f)
+        except Exception:
+            users = {}
+        self._log_len = 0
+        if os.path.exists(self.log_file):
+            with open(self.log_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        rec = json.loads(line)
+                    except ValueError:
+                        # torn last line from a crash mid-append
+                        continue
+                    users[rec['username']] = rec['info']
+                    self._log_len += 1
+        self._users = users
+        self._signature = sig
+
+    def get(self, username):
+        self._refresh()
+        return self._users.get(username)
+
+    def exists(self, username):
+        return self.get(username) is not None
+
+    def check_password(self, username, password):
+        info = self.get(username)
+        return info is not None and info['password'] == password
+
+    def add(self, username, info):
+        """Register a new account; False if the username is taken."""
+        with file_lock(self.users_file):
+            if self.exists(username):
+                return False
+            with open(self.log_file, 'a', encoding='utf-8') as f:
+                f.write(json.dumps({'username': username, 'info': info}) + '\n')
+            self._users[username] = info
+            self._log_len += 1
+            self._signature = self._stat()
+            if self._log_len >= LOG_COMPACT_THRESHOLD:
+                self.compact()
+            return True
+
+    def all(self):
+        self._refresh()
+        return dict(self._users)
+
+    def replace_all(self, users):
+        with file_lock(self.users_file):
+            with atomic_write(self.users_file, 'w', encoding='utf-8') as f:
+                json.dump(users, f, indent=2)
+            if os.path.exists(self.log_file):
+                os.remove(self.log_file)
+            self._users = dict(users)
+            self._log_len = 0
+            self._signature = self._stat()
+
+    def compact(self):
+        """Fold the registration log into users.json."""
+        with file_lock(self.users_file):
+            self.replace_all(self.all())
+
+
+class SQLiteUserRegistry:
+    """The same interface on top of the users table (primary-key lookups)."""
+
+    def __init__(self, path=None):
+        self.conn = sqlite_connect(path)
+
+    def get(self, username):
+        row = self.conn.execute('SELECT password FROM users WHERE username = ?', (username,)).fetchone()
+        return {'password': row[0]} if row else None
+
+    def exists(self, username):
+        return self.get(username) is not None
+
+    def check_password(self, username, password):
+        info = self.get(username)
+        return info is not None and info['password'] == password
+
+    def add(self, username, info):
+        with self.conn:
+            cur = self.conn.execute(
+                'INSERT OR IGNORE INTO users (username, password) VALUES (?, ?)', (username, info['password']))
+        return cur.rowcount == 1
+
+    def all(self):
+        rows = self.conn.execute('SELECT username, password FROM users')
+        return {u: {'password': p} for u, p in rows}
+
+    def replace_all(self, users):
+        with self.conn:
+            self.conn.execute('DELETE FROM users')
+            self.conn.executemany(
+                'INSERT INTO users (username, password) VALUES (?, ?)',
+                [(u, info['password']) for u, info in users.items()],
+            )
+
+    def compact(self):
+        pass
+
+
+_registry = None
+
+def get_registry():
+    """The process-wide registry for the configured storage backend."""
+    global _registry
+    if _registry is None:
+        _registry = SQLiteUserRegistry() if STORAGE_BACKEND == 'sqlite' else UserRegistry()
+    return _registry
@@ -1,38 +1,35 @@
-import json
-from utils.paths import USERS_FILE
 from models.user import User
+from user_registry import get_registry
 
 def load_users():
-    try:
-        with open(USERS_FILE, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except Exception:
-        return {}
+    return get_registry().all()
 
 def save_users(users):
-    with open(USERS_FILE, 'w', encoding='utf-8') as f:
-        json.dump(users, f, indent=2)
+    get_registry().replace_all(users)
 
 def register():
-    users = load_users()
+    registry = get_registry()
     print('--- Register ---')
     username = input('Choose username: ').strip()
-    if username in users:
+    if registry.exists(username):
         print('Username exists')
         return
     password = input('Choose password: ').strip()
-    users[username] = {'password': password}
-    save_users(users)
+    registry.add(username, {'password': password})
     print('Registered. Please login.')
 
 def login():
-    users = load_users()
     print('--- Login ---')
     username = input('Username: ').strip()
     password = input('Password: ').strip()
-    if username in users and users[username]['password'] == password:
+    if get_registry().check_password(username, password):
+        try:
+            user = User(username)
+        except Exception as e:
+            print('Cannot load tasks:', e)
+            return None
         print(f'Welcome {username}')
-        return User(username)
+        return user
     print('Invalid credentials')
     return None
 
@@ -0,0 +1,77 @@
+import os
+import stat
+import tempfile
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: only threads of this process are serialized
+    fcntl = None
+
+# os.umask() can only be read by setting it, so read it once at import
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+# lock file -> [thread lock, open lock file, depth], so a process can re-enter its own lock
+_locks = {}
+_locks_guard = threading.Lock()
+
+@contextmanager
+def file_lock(path):
+    """Exclusive advisory lock on path (via path + '.lock'), shared by threads and processes.
+
+    Re-entrant within a thread, so a locked section may call code that locks again.
+    """
+    lock_path = path + '.lock'
+    with _locks_guard:
+        entry = _locks.setdefault(lock_path, [threading.RLock(), None, 0])
+    with entry[0]:
+        if entry[2] == 0:
+            f = open(lock_path, 'a')
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            entry[1] = f
+        entry[2] += 1
+        try:
+            yield
+        finally:
+            entry[2] -= 1
+            if entry[2] == 0:
+                f, entry[1] = entry[1], None
+                if fcntl is not None:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+                f.close()
+
+@contextmanager
+def atomic_write(path, mode='w', **kwargs):
+    """Write to a temporary file next to path and move it into place only once it is complete."""
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path) or '.', prefix=os.path.basename(path) + '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, mode, **kwargs) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp creates the file as 0600; keep the replaced file's mode, or give a new file
+        # the usual one, so other users' processes sharing DATA_DIR can still read it
+        try:
+            mode = stat.S_IMODE(os.stat(path).st_mode)
+        except FileNotFoundError:
+            mode = 0o666 & ~_UMASK
+        os.chmod(tmp, mode)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+def file_signature(*paths):
+    """(inode, mtime, size) of each path (None if missing); changes whenever one of them is rewritten or appended to."""
+    sig = []
+    for p in paths:
+        try:
+            st = os.stat(p)
+            sig.append((st.st_ino, st.st_mtime_ns, st.st_size))
+        except FileNotFoundError:
+            sig.append(None)
+    return tuple(sig)
@@ -2,8 +2,10 @@ import os
 
 DATA_DIR = "data"
 USERS_FILE = "users.json"
+# task storage backend, see models/storage.py BACKENDS
+STORAGE_BACKEND = os.environ.get("FOCUSFLOW_STORAGE", "csv")
+DB_FILE = os.path.join(DATA_DIR, "focusflow.db")
 
-os.makedirs(DATA_DIR, exist_ok=True)
-if not os.path.exists(USERS_FILE):
-    with open(USERS_FILE, "w", encoding="utf-8") as f:
-        f.write("{}")
+def ensure_data_dir():
+    """Create the data directory; called by the storage backends rather than at import."""
+    os.makedirs(DATA_DIR, exist_ok=True)